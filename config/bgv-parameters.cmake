@@ -0,0 +1,14 @@
+# generated by `python3 scripts/bgv-parameters.py registry`; do not edit
+set(PIA_MPC_PARAMETER_SETS 64 128)
+
+set(PIA_MPC_64_PLAINTEXT_MODULUS 0x8822d80623320001_int) # 9809640459238244353
+set(PIA_MPC_64_LOG_N 16)
+set(PIA_MPC_64_CIPHERTEXT_MODULUS 0x591f5b834c0d961f67343bcc8902bdeda2771f54306ff151162ff8d2b40f4194dc0001_int) # 676310504550516370745208338938566342426856908484397554505023779011987369401721290753
+set(PIA_MPC_64_STATISTICAL_SECURITY 64)
+set(PIA_MPC_64_BOUND 0x2a8af94f7f989c000000000000000000280000_int) # 948737629777761053554520993225066571922669568
+
+set(PIA_MPC_128_PLAINTEXT_MODULUS 0xd3055e85c25e7071664d1d2884720001_int) # 280494985738912542904307153613171589121
+set(PIA_MPC_128_LOG_N 16)
+set(PIA_MPC_128_CIPHERTEXT_MODULUS 0xb271e2d502f0fe484bb79988ee13d3b615be8ca520c3dc823437584f4f670def499322c07e51826122889ac2167f0fc6c59f1a88d40001_int) # 1979074704009349302955958205749626642941772258374459894984428564175802086676614232564185422620348676185507709281235287419829477441537
+set(PIA_MPC_128_STATISTICAL_SECURITY 80)
+set(PIA_MPC_128_BOUND 0x41f1cf55a8e0f000000000000000000000000000000000000000280000_int) # 1777862088167557546070947868375660073912324097082010113150039487938560
@@ -1,19 +1,65 @@
+from fractions import Fraction
+from csv import QUOTE_NONE, writer
+import functools
+import hashlib
+from itertools import product
+import json
 import math
-import sympy
+import os
 import random
-
-def ntt_prime(log_m, bits):
-    m = 2**log_m
-    p = 0
-    is_prime = False
-    while p % m != 1 or not is_prime:
-        p = random.randint(2**(bits - log_m - 1), 2**(bits - log_m)-1) << log_m
-        p += 1
-        is_prime = sympy.ntheory.isprime(p)
+import sys
+
+def cache_file():
+    return os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "pia-mpc", "bgv-parameters", "primes.json")
+
+@functools.cache
+def cached_primes(file):
+    """Primes found by `ntt_prime` (loaded once per process, `ntt_prime` adds new ones)"""
+    try:
+        with open(file) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def ntt_prime(log_m, bits, cache=True):
+    """
+    Random prime p = 1 mod 2^log_m with `bits` bits.
+
+    Found primes are cached on disk keyed by log_m, bits, and the state of `random`, together with the number of drawn candidates;
+    for cached primes, the candidates are drawn again so that the state of `random` afterwards is the same as without the cache.
+    """
+    def draw():
+        return (random.randint(2**(bits - log_m - 1), 2**(bits - log_m)-1) << log_m) + 1
+
+    key = f"{log_m}-{bits}-{hashlib.sha256(repr(random.getstate()).encode()).hexdigest()}"
+    primes = cached_primes(cache_file()) if cache else {}
+    if key in primes:
+        p, draws = primes[key]
+        for _ in range(draws):
+            draw()
+        return p
+
+    from sympy.ntheory import isprime
+    draws = 0
+    while True:
+        p = draw()
+        draws += 1
+        if isprime(p):
+            break
+
+    if cache:
+        primes[key] = [p, draws]
+        file = cache_file()
+        os.makedirs(os.path.dirname(file), exist_ok=True)
+        with open(f"{file}.{os.getpid()}", "tw") as f:
+            json.dump(primes, f)
+        os.replace(f"{file}.{os.getpid()}", file)
     return p
 
 class Norm:
     """Infinity norm"""
+    __slots__ = ("max_value", "dim")
+
     def __init__(self, max_value, dim=1):
         self.max_value = max_value
         self.dim = dim
@@ -46,7 +92,118 @@ class Norm:
         return Norm(math.ceil(self.max_value / by), self.dim)
 
 
+LOG_MARGIN = 2**-40 # relative error of the float64 bits of a `LogNorm`, far above the rounding errors of the few operations per noise bound
+
+def upward(bits):
+    return bits + abs(bits) * LOG_MARGIN + LOG_MARGIN
+
+def downward(bits):
+    return bits - abs(bits) * LOG_MARGIN - LOG_MARGIN
+
+class LogNorm:
+    """
+    Upper bound of an infinity norm as log2 of the maximal value and of the dimension (float64 or NumPy arrays of them).
+
+    Operations behave like `Norm` and are rounded upward, such that `2**log_value` is at least the exact `Norm.max_value`.
+    """
+    __slots__ = ("log_value", "log_dim")
+
+    def __init__(self, log_value, log_dim=0):
+        self.log_value = log_value
+        self.log_dim = log_dim
+
+    @classmethod
+    def of(cls, max_value, dim=1):
+        """Bound of exact values (Python integers or arrays of them)"""
+        import numpy
+        log2 = numpy.frompyfunc(math.log2, 1, 1)
+        return cls(upward(numpy.asarray(log2(max_value), dtype=numpy.float64)), numpy.asarray(log2(dim), dtype=numpy.float64))
+
+    def __add__(self, other):
+        import numpy
+        if isinstance(other, LogNorm):
+            # dimension 1 takes the other dimension, otherwise both are equal
+            return LogNorm(upward(numpy.logaddexp2(self.log_value, other.log_value)), numpy.maximum(self.log_dim, other.log_dim))
+        return NotImplemented
+    __radd__ = __add__
+    __sub__ = __add__
+    __rsub__ = __add__
+
+    def __mul__(self, other):
+        import numpy
+        if isinstance(other, LogNorm):
+            both = (self.log_dim > 0) & (other.log_dim > 0)
+            return LogNorm(upward(self.log_value + other.log_value + numpy.where(both, self.log_dim, 0)), numpy.maximum(self.log_dim, other.log_dim))
+        return NotImplemented
+    __rmul__ = __mul__
+
+    def __truediv__(self, by):
+        import numpy
+        if isinstance(by, LogNorm):
+            # ceil(x / by) <= x / by + 1
+            return LogNorm(upward(numpy.logaddexp2(self.log_value - downward(by.log_value), 0)), self.log_dim)
+        return NotImplemented
+
+
+class Variance:
+    """
+    Heuristic noise: the variance of each coefficient, assuming independent coefficients whose sums and products are approximately Gaussian,
+    together with the worst-case `Norm`, which bounds the heuristic bound.
+    """
+    __slots__ = ("variance", "norm")
+
+    def __init__(self, variance, norm):
+        self.variance = variance
+        self.norm = norm
+
+    @classmethod
+    def constant(cls, value):
+        return cls(Fraction(value)**2, Norm(value))
+
+    @classmethod
+    def uniform(cls, max_value, dim=1):
+        """Uniform integers in [-max_value, max_value]"""
+        return cls(Fraction(max_value * (max_value + 1), 3), Norm(max_value, dim))
+
+    @classmethod
+    def gaussian(cls, standard_deviation, max_value, dim=1):
+        """(Discrete) Gaussian with the given standard deviation, cut off at max_value"""
+        return cls(Fraction(standard_deviation)**2, Norm(max_value, dim))
+
+    @classmethod
+    def bounded(cls, norm):
+        """Any distribution within a norm, e.g., chosen by the prover of a zero-knowledge proof"""
+        return cls(Fraction(norm.max_value)**2, norm)
+
+    def __add__(self, other):
+        if isinstance(other, Variance):
+            return Variance(self.variance + other.variance, self.norm + other.norm)
+        return NotImplemented
+    __radd__ = __add__
+    __sub__ = __add__
+    __rsub__ = __add__
+
+    def __mul__(self, other):
+        if isinstance(other, Variance):
+            # each coefficient of a product of polynomials sums dim products of coefficients
+            dim = self.norm.dim if self.norm.dim > 1 and other.norm.dim > 1 else 1
+            return Variance(self.variance * other.variance * dim, self.norm * other.norm)
+        return NotImplemented
+    __rmul__ = __mul__
+
+    def __truediv__(self, by):
+        # rounding up adds less than 1
+        return Variance(self.variance / by**2 + 1, self.norm / by)
+
+    def max_value(self, log_failure):
+        """Bound of all coefficients except with probability 2^log_failure (Gaussian tail and union bound), at most the worst-case bound"""
+        tail = 2 * (math.log(2 * self.norm.dim) - log_failure * math.log(2))
+        return min(self.norm.max_value, math.isqrt(math.ceil(self.variance * Fraction(tail))) + 1)
+
+
 class BGVKey:
+    __slots__ = ("plaintext_modulus", "private_key", "noise")
+
     def __init__(self, plaintext_modulus, private_key, noise):
         self.plaintext_modulus = plaintext_modulus
         self.private_key = private_key
@@ -64,13 +221,15 @@ class BGVKey:
 
 
 class BGVNoise:
+    __slots__ = ("plaintext", "randomness")
+
     def __init__(self, plaintext_norm, randomness_norm_0, randomness_norm_1, randomness_norm_2):
         self.plaintext = plaintext_norm
         self.randomness = (randomness_norm_0, randomness_norm_1, randomness_norm_2)
 
     def __add__(self, other):
         assert len(self.randomness) == 3
-        if isinstance(other, Norm):
+        if isinstance(other, (Norm, LogNorm, Variance)):
             return BGVNoise(self.plaintext + other, *self.randomness)
         if isinstance(other, BGVNoise):
             assert len(other.randomness) == 3
@@ -82,7 +241,7 @@ class BGVNoise:
 
     def __mul__(self, other):
         assert len(self.randomness) == 3
-        if isinstance(other, Norm):
+        if isinstance(other, (Norm, LogNorm, Variance)):
             return BGVNoise(self.plaintext * other, *[r * other for r in self.randomness])
         return NotImplemented
     __rmul__ = __mul__
@@ -152,43 +311,370 @@ Parameters:
     }
     return result
 
-def table(seed=42):
+def drowned_multiplications(p, N, zeroknowledge_sec=80, soundness_sec=128, statistical_sec=None, U_factor=2):
+    """
+    `drowned_multiplication` in the log2 domain (see `LogNorm`) for arrays of parameters.
+
+    All arguments broadcast against each other like NumPy arrays; `p` and `N` are (arrays of) Python integers.
+    The result has the arrays "U", "V", "log_q" (an upper bound of `bits(4 * noise)`), and the `LogNorm`s "bound", "drown_bound", and "noise".
+    """
+    import numpy
+    if statistical_sec is None:
+        statistical_sec = zeroknowledge_sec
+    p = numpy.asarray(p, dtype=object)
+    N = numpy.asarray(N, dtype=object)
+    V = numpy.ceil((numpy.asarray(soundness_sec) + 2) / numpy.log2(2 * N.astype(numpy.float64) + 1)).astype(numpy.int64)
+    U = U_factor * V
+
+    plaintext_modulus = LogNorm.of(p)
+    key = BGVKey(plaintext_modulus, LogNorm.of(1, N), LogNorm.of(20, N))
+    encrypted = BGVNoise(LogNorm.of(p // 2, N), LogNorm.of(1, N), LogNorm.of(20, N), LogNorm.of(20, N))
+    checked_cyphertexts = LogNorm(numpy.asarray(zeroknowledge_sec + 1, dtype=numpy.float64)) * encrypted
+    inputs = checked_cyphertexts - checked_cyphertexts
+
+    ciphertext = LogNorm.of(p // 2) * inputs
+
+    randomness_0, _, randomness_2 = encrypted.randomness
+    bound = ciphertext.noise(key) / plaintext_modulus + randomness_0 * key.noise + randomness_2 * key.private_key
+    drown_bound = LogNorm(numpy.asarray(statistical_sec, dtype=numpy.float64)) * bound
+    mask = BGVNoise(encrypted.plaintext, randomness_0, drown_bound, randomness_2)
+
+    masked = ciphertext + mask
+
+    noise = masked.noise(key)
+    return {
+        "U" : U,
+        "V" : V,
+        "log_q" : numpy.ceil(upward(noise.log_value + 2)).astype(numpy.int64),
+        "bound" : bound,
+        "drown_bound" : drown_bound,
+        "noise" : noise
+    }
+
+ERROR_STANDARD_DEVIATION = 3.2 # of the key and encryption noise, which `Norm` bounds by 20
+
+def heuristic_drowned_multiplication(p=9930515109164351489, N=2**14, zeroknowledge_sec=80, soundness_sec=128, statistical_sec=None, U_factor=2, log_failure=None):
+    """
+    `drowned_multiplication` with heuristic noise bounds (see `Variance`) that hold except with probability 2^log_failure each
+    (by default 2^(-statistical_sec-1), so that the failure probability adds at most as much to the statistical distance as the drowning itself).
+
+    The ciphertexts of the zero-knowledge proof are only known to be within the proven bounds;
+    the bound before drowning is heuristic as well, so its failure probability adds to the statistical distance of the drowning.
+    """
+    if statistical_sec is None:
+        statistical_sec = zeroknowledge_sec
+    if log_failure is None:
+        log_failure = -statistical_sec - 1
+    V = math.ceil((soundness_sec + 2) / math.log2(2 * N + 1))
+    U = U_factor * V
+
+    error = Variance.gaussian(ERROR_STANDARD_DEVIATION, 20, N)
+    key = BGVKey(Variance.constant(p), Variance.uniform(1, N), error)
+    inputs = zk_noise(p, N, U, V, zeroknowledge_sec)
+    inputs = BGVNoise(Variance.bounded(inputs.plaintext), *[Variance.bounded(r) for r in inputs.randomness])
+
+    ciphertext = Variance.constant(p // 2) * inputs
+
+    mask = BGVNoise(Variance.uniform(p // 2, N), Variance.uniform(1, N), error, error)
+    randomness_0, _, randomness_2 = mask.randomness
+    bound = (ciphertext.noise(key) / p + randomness_0 * key.noise + randomness_2 * key.private_key).max_value(log_failure)
+    drown_bound = 2**statistical_sec * bound
+    mask = BGVNoise(mask.plaintext, randomness_0, Variance.uniform(drown_bound, N), randomness_2)
+
+    masked = ciphertext + mask
+
+    noise = masked.noise(key).max_value(log_failure)
+    return {
+        "U" : U,
+        "V" : V,
+        "bound" : bound,
+        "drown_bound" : drown_bound,
+        "noise" : noise,
+        "log_q" : bits(4 * noise),
+    }
+
+def parameters(log_p, log_n, zeroknowledge_sec, soundness_sec, seed=42, cache=True, U_factor=2, log_failure=None):
+    """
+    Sample NTT-friendly primes and derive the ciphertext modulus for the given parameter set (see `ntt_prime` for `cache`).
+
+    The result also has the log q of the heuristic noise analysis ("heuristic_log_q", see `heuristic_drowned_multiplication`), for which no prime is sampled.
+    """
+    random.seed(seed)
+    N = 2**log_n
+
+    p = ntt_prime(log_n+1, log_p, cache=cache)
+    results = drowned_multiplication(p, N, zeroknowledge_sec, soundness_sec, U_factor=U_factor)
+
+    noise = results["noise"].max_value
+
+    log_q = bits(4 * noise)
+    q = ntt_prime(log_n+1, log_q, cache=cache)
+
+    heuristic = heuristic_drowned_multiplication(p, N, zeroknowledge_sec, soundness_sec, U_factor=U_factor, log_failure=log_failure)
+
+    return {
+        "log_p" : log_p,
+        "log_n" : log_n,
+        "zeroknowledge_sec" : zeroknowledge_sec,
+        "soundness_sec" : soundness_sec,
+        "U_factor" : U_factor,
+        "p" : p,
+        "N" : N,
+        "U" : results["U"],
+        "V" : results["V"],
+        "bound" : results["bound"].max_value,
+        "drown_bound" : results["drown_bound"].max_value,
+        "noise" : noise,
+        "log_q" : log_q,
+        "q" : q,
+        "heuristic_noise" : heuristic["noise"],
+        "heuristic_log_q" : heuristic["log_q"],
+    }
+
+# parameter sets built as "mac-<name>-<N>" and "drowning-bgv-<name>" (see "CMakeLists.txt")
+PARAMETER_SETS = {
+    "64" : dict(log_p=64, log_n=16, zeroknowledge_sec=64, soundness_sec=128),
+    "128" : dict(log_p=128, log_n=16, zeroknowledge_sec=80, soundness_sec=128),
+}
+
+def registry(sets=PARAMETER_SETS, cmake="config/bgv-parameters.cmake", manifest="config/bgv-parameters.json", seed=42, cache=True):
+    """
+    Write the parameter sets as CMake include file (read by "CMakeLists.txt") and as JSON manifest (read by "authentication.py" and "mac.py").
+
+    :param sets: Parameter sets by name (the suffix of the binaries), each with "log_p", "log_n", "zeroknowledge_sec", "soundness_sec", and optionally "U_factor".
+    """
+    entries = []
+    for name, param in sets.items():
+        result = parameters(**param, seed=seed, cache=cache)
+        entries.append({
+            "name" : str(name),
+            **param,
+            "seed" : seed,
+            "statistical_sec" : result["zeroknowledge_sec"],
+            "U" : result["U"],
+            "V" : result["V"],
+            "log_q" : result["log_q"],
+            "p" : result["p"],
+            "q" : result["q"],
+            "bound" : result["bound"],
+        })
+
+    with open(cmake, "tw") as f:
+        print(f"# generated by `python3 {' '.join(sys.argv)}`; do not edit", file=f)
+        print(f"set(PIA_MPC_PARAMETER_SETS {' '.join(entry['name'] for entry in entries)})", file=f)
+        for entry in entries:
+            prefix = f"PIA_MPC_{entry['name']}"
+            print(file=f)
+            print(f"set({prefix}_PLAINTEXT_MODULUS {entry['p']:#x}_int) # {entry['p']}", file=f)
+            print(f"set({prefix}_LOG_N {entry['log_n']})", file=f)
+            print(f"set({prefix}_CIPHERTEXT_MODULUS {entry['q']:#x}_int) # {entry['q']}", file=f)
+            print(f"set({prefix}_STATISTICAL_SECURITY {entry['statistical_sec']})", file=f)
+            print(f"set({prefix}_BOUND {entry['bound']:#x}_int) # {entry['bound']}", file=f)
+    with open(manifest, "tw") as f:
+        json.dump(entries, f, indent=4)
+        print(file=f)
+
+def table(seed=42, cache=True, heuristic=False, log_failure=None):
+    """
+    Print the parameter sets of the paper as Latex table.
+
+    :param heuristic: Add the log q of the heuristic noise analysis (with failure probability 2^log_failure per bound, see `heuristic_drowned_multiplication`) as column.
+    """
     params = [
         dict(log_p=64, log_n=16, zeroknowledge_sec=64, soundness_sec=128),
         dict(log_p=128, log_n=16, zeroknowledge_sec=80, soundness_sec=128),
         dict(log_p=128, log_n=16, zeroknowledge_sec=128, soundness_sec=128),
     ]
 
-    print(r"\begin{tabular}{c c c c c c c}")
+    print(r"\begin{tabular}{c c c c c c c" + (" c" if heuristic else "") + "}")
     print(r"\toprule")
-    print(r"log-p & log-n & sec-zk & sec-sound & U & V & log-q \\")
+    print(r"log-p & log-n & sec-zk & sec-sound & U & V & log-q" + (r" & log-q (heuristic)" if heuristic else "") + r" \\")
     print(r"\midrule")
     for param in params:
-        random.seed(seed)
-        log_p = param["log_p"]
-        log_n = param["log_n"]
-        N = 2**log_n
-        zeroknowledge_sec = param["zeroknowledge_sec"]
-        soundness_sec = param["soundness_sec"]
-
-        p = ntt_prime(log_n+1, log_p)
-        results = drowned_multiplication(p, N, zeroknowledge_sec, soundness_sec)
-
-        U = results["U"]
-        V = results["V"]
-        bound = results["bound"].max_value
-        drown_bound = results["drown_bound"].max_value
-        noise = results["noise"].max_value
-
-        log_q = bits(4 * noise)
-        q = ntt_prime(log_n+1, log_q)
-
+        result = parameters(**param, seed=seed, cache=cache, log_failure=log_failure)
+        log_p = result["log_p"]
+        log_n = result["log_n"]
+        zeroknowledge_sec = result["zeroknowledge_sec"]
+        soundness_sec = result["soundness_sec"]
+        p = result["p"]
+        N = result["N"]
+        U = result["U"]
+        V = result["V"]
+        bound = result["bound"]
+        drown_bound = result["drown_bound"]
+        noise = result["noise"]
+        log_q = result["log_q"]
+        q = result["q"]
 
         print(f"% p = {p} & N = {N} & ZK & soundness & U (value) & V (value) & q = {q} % bound = {bound} & drown_bound = {drown_bound} & noise = {noise}")
-        print(f"{log_p} & {log_n} & {zeroknowledge_sec} & {soundness_sec} & {U} & {V} & {log_q} \\\\")
+        print(f"{log_p} & {log_n} & {zeroknowledge_sec} & {soundness_sec} & {U} & {V} & {log_q}" + (f" & {result['heuristic_log_q']}" if heuristic else "") + " \\\\")
     print(r"\bottomrule")
     print(r"\end{tabular}")
 
+# maximal log q of the homomorphic encryption standard (ternary secret, error with standard deviation 3.2) by security level and log N
+LATTICE_BOUNDS = {
+    128 : { 10 : 27, 11 : 54, 12 : 109, 13 : 218, 14 : 438, 15 : 881 },
+    192 : { 10 : 19, 11 : 37, 12 : 75, 13 : 152, 14 : 305, 15 : 611 },
+    256 : { 10 : 14, 11 : 29, 12 : 58, 13 : 118, 14 : 237, 15 : 476 },
+}
+
+@functools.cache
+def lattice_security(log_n, log_q, sigma=3.2, model="core-svp"):
+    """
+    Bits of security of RLWE with ring dimension 2^log_n and modulus 2^log_q against the primal uSVP attack.
+
+    The attack succeeds with BKZ block size b if sigma * sqrt(b) <= delta(b)^(2b - d - 1) * q^(m / d) for some number of samples m and d = N + m + 1.
+    The cost of BKZ is 2^(0.292 b) in the core-SVP model ("core-svp"), and 2^(0.292 b + 16.4 + log2(8 d)) with sieving ("bkz-sieve").
+    At the bounds of the homomorphic encryption standard (`LATTICE_BOUNDS`), the core-SVP model is below the security level (by 14 to 35 bits)
+    and sieving is above it (by 0.5 to 15 bits), so only the core-SVP model is conservative.
+    """
+    import numpy
+    N = 2**log_n
+    m = numpy.arange(1, 2 * N + 1)
+    d = N + m + 1
+
+    def dimension(b):
+        """Smallest lattice dimension for which block size b succeeds (or None)"""
+        log_delta = math.log2((math.pi * b)**(1 / b) * b / (2 * math.pi * math.e)) / (2 * (b - 1))
+        success = math.log2(sigma * math.sqrt(b)) <= (2 * b - d - 1) * log_delta + m / d * log_q
+        return d[numpy.argmax(success)].item() if success.any() else None
+
+    # block sizes below 40 are out of the range of the model
+    low, high = 40, 2 * N
+    if dimension(low) is not None:
+        high = low
+    while high - low > 1:
+        middle = (low + high) // 2
+        if dimension(middle) is None:
+            low = middle
+        else:
+            high = middle
+    if model == "core-svp":
+        return 0.292 * high
+    if model == "bkz-sieve":
+        return 0.292 * high + 16.4 + math.log2(8 * (dimension(high) or d[-1].item()))
+    raise ValueError(f"unknown model {model}, expected 'core-svp' or 'bkz-sieve'")
+
+def lattice_secure(log_n, log_q, sec, sigma=3.2, model="core-svp"):
+    """Whether `lattice_security` is at least `sec` and log q within the standard bound of N (for the next listed security level)"""
+    levels = [level for level in LATTICE_BOUNDS if level >= sec]
+    if levels and log_n in LATTICE_BOUNDS[min(levels)] and log_q > LATTICE_BOUNDS[min(levels)][log_n]:
+        return False
+    return lattice_security(log_n, log_q, sigma, model) >= sec
+
+def security(log_n=(10, 17), log_q=None, sec=128, sigma=3.2, model="core-svp"):
+    """
+    Print the lattice security of each ring dimension for log q as TSV, or the maximal secure log q if log q is not given.
+
+    :param log_n, log_q: Grid axes (a tuple as arguments to `range`, a list as is, or a single value).
+    """
+    tsv = writer(sys.stdout, delimiter="\t", quoting=QUOTE_NONE)
+    if log_q is None:
+        tsv.writerow(["log_n", "sec", "log_q", "standard_log_q"])
+        for n in axis(log_n):
+            # largest secure log q by bisection (security decreases with q)
+            low, high = 1, 2**n
+            while high - low > 1:
+                middle = (low + high) // 2
+                if lattice_security(n, middle, sigma, model) >= sec:
+                    low = middle
+                else:
+                    high = middle
+            levels = [level for level in LATTICE_BOUNDS if level >= sec]
+            tsv.writerow([n, sec, low, LATTICE_BOUNDS[min(levels)].get(n, "") if levels else ""])
+    else:
+        tsv.writerow(["log_n", "log_q", "lattice_sec", "secure"])
+        for n, q in product(axis(log_n), axis(log_q)):
+            tsv.writerow([n, q, f"{lattice_security(n, q, sigma, model):.1f}", int(lattice_secure(n, q, sec, sigma, model))])
+
+def axis(values):
+    """A grid axis given on the command line: a tuple as arguments to `range`, a list as is, and anything else as single value"""
+    if isinstance(values, tuple):
+        return list(range(*values))
+    if isinstance(values, list):
+        return values
+    return [values]
+
+def pareto(smaller, larger, group, chunk=256):
+    """Mask of the points that no other point of the same group dominates (at least as good in every objective and better in one)"""
+    import numpy
+    def dominated(points, by):
+        return numpy.any(numpy.all(by[None, :, :] <= points[:, None, :], axis=2) & numpy.any(by[None, :, :] < points[:, None, :], axis=2), axis=1)
+
+    objectives = numpy.column_stack([*smaller, *[-x for x in larger]])
+    optimal = numpy.zeros(len(objectives), dtype=bool)
+    for value in numpy.unique(group):
+        indices = numpy.flatnonzero(group == value)
+        # sorted lexicographically, a point can only be dominated by earlier points, and then also by an earlier point of the front
+        points, inverse = numpy.unique(objectives[indices], axis=0, return_inverse=True)
+        front = numpy.zeros(len(points), dtype=bool)
+        for start in range(0, len(points), chunk):
+            candidates = points[start:start + chunk]
+            front[start:start + chunk] = ~(dominated(candidates, points[:start][front[:start]]) | dominated(candidates, candidates))
+        optimal[indices] = front[inverse.reshape(-1)]
+    return optimal
+
+def search(log_p=[64, 128], log_n=(12, 17), zeroknowledge_sec=[40, 64, 80, 128], soundness_sec=[40, 64, 80, 128], U_factor=[1, 2, 4], lattice_sec=128, lattice_model="core-svp", log_failure=None, seed=42, cache=True, all=False):
+    """
+    Find the smallest ciphertext modulus for each parameter set of a grid and print the Pareto set as TSV.
+
+    The noise of the whole grid is bounded at once in the log2 domain (`drowned_multiplications`),
+    and the Pareto set is computed from these bounds.
+    A parameter set is in the Pareto set if no other one with the same plaintext modulus has a smaller or equal N, log q, and U
+    with an equal or higher zero-knowledge and soundness security (and differs in one of them).
+    Only parameter sets whose N gives `lattice_sec` bits of security for the bound of log q (see `lattice_secure`) are in the Pareto set,
+    which therefore has the smallest secure N.
+    For the Pareto set, log q is recomputed exactly, the NTT-friendly q is sampled as by `parameters`,
+    and the log q of the heuristic noise analysis (with failure probability 2^log_failure per bound, see `heuristic_drowned_multiplication`) is added.
+
+    :param log_p, log_n, zeroknowledge_sec, soundness_sec, U_factor: Grid axes (a tuple as arguments to `range`, a list as is, or a single value).
+    :param lattice_sec: Target lattice security in bits (`None` to not check it).
+    :param lattice_model: Cost model of `lattice_security`.
+    :param all: Print every parameter set of the grid (with a column whether it is in the Pareto set).
+    """
+    import numpy
+    axes = [axis(log_p), axis(log_n), axis(zeroknowledge_sec), axis(soundness_sec), axis(U_factor)]
+    grid = { k : numpy.array(v) for k, v in zip(["log_p", "log_n", "zeroknowledge_sec", "soundness_sec", "U_factor"], zip(*product(*axes))) }
+
+    # the p of `parameters`: the first prime drawn after seeding
+    primes = {}
+    for key in product(axes[0], axes[1]):
+        random.seed(seed)
+        primes[key] = ntt_prime(key[1]+1, key[0], cache=cache)
+    p = numpy.array([primes[key] for key in zip(grid["log_p"].tolist(), grid["log_n"].tolist())], dtype=object)
+    N = numpy.array([2**int(x) for x in grid["log_n"]], dtype=object)
+
+    bounds = drowned_multiplications(p, N, grid["zeroknowledge_sec"], grid["soundness_sec"], U_factor=grid["U_factor"])
+    grid |= { k : bounds[k] for k in ["U", "V", "log_q"] }
+    grid["lattice_sec"] = numpy.array([lattice_security(n, q, model=lattice_model) for n, q in zip(grid["log_n"].tolist(), grid["log_q"].tolist())])
+    if lattice_sec is None:
+        secure = numpy.ones(len(grid["log_n"]), dtype=bool)
+    else:
+        secure = numpy.array([lattice_secure(n, q, lattice_sec, model=lattice_model) for n, q in zip(grid["log_n"].tolist(), grid["log_q"].tolist())], dtype=bool)
+    # insecure parameter sets only compete among themselves
+    optimal = secure & pareto([grid["log_n"], grid["log_q"], grid["U"]], [grid["zeroknowledge_sec"], grid["soundness_sec"]], numpy.where(secure, grid["log_p"], -1))
+
+    results = [{ k : v[i].item() for k, v in grid.items() } for i in range(len(optimal))]
+    exact = {} # log q and q do not depend on the soundness security and U
+    for result, is_optimal in zip(results, optimal):
+        if is_optimal:
+            key = result["log_p"], result["log_n"], result["zeroknowledge_sec"]
+            if key not in exact:
+                exact[key] = parameters(*key, result["soundness_sec"], seed=seed, cache=cache, log_failure=log_failure)
+            assert exact[key]["log_q"] <= result["log_q"]
+            result["log_q"] = exact[key]["log_q"]
+            result["q"] = exact[key]["q"]
+            result["heuristic_log_q"] = exact[key]["heuristic_log_q"]
+            result["lattice_sec"] = lattice_security(result["log_n"], result["log_q"], model=lattice_model)
+        result["lattice_sec"] = f"{result['lattice_sec']:.1f}"
+
+    columns = ["log_p", "log_n", "zeroknowledge_sec", "soundness_sec", "U_factor", "U", "V", "log_q", "heuristic_log_q", "lattice_sec", "q"]
+    tsv = writer(sys.stdout, delimiter="\t", quoting=QUOTE_NONE)
+    tsv.writerow(columns + (["pareto"] if all else []))
+    for result, is_optimal in sorted(zip(results, optimal), key=lambda x: [x[0][k] for k in columns[:5]]):
+        if is_optimal or all:
+            tsv.writerow([result.get(k, "") for k in columns] + ([int(is_optimal)] if all else []))
+
 if __name__ == "__main__":
     import fire
     fire.Fire()
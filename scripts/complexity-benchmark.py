@@ -0,0 +1,90 @@
+from csv import QUOTE_NONE, writer
+import io
+import contextlib
+import json
+import os
+import pickle
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import complexity
+
+PROTOCOLS = ["KellerPastroRotaru2017", "BaumCozzoSmart2019", "BaumOrsiniScholl2016", "SpiniFehr2016", "CunninghamFullerYakoubov2016", "CohenDoernerKondiShelat2023", "BaumMelissarisRachuriScholl2023", "OurProtocol"]
+TABLES = { f"communication-collapse-{collapse}" : { "communication" : True, "collapse" : collapse } for collapse in range(5) }
+TABLES |= { f"computation-collapse-{collapse}" : { "computation" : True, "collapse" : collapse } for collapse in range(2) }
+TABLES |= { f"{kind}-O-notation" : { kind : True, "collapse" : collapse, "O_notation" : "KEEP_FACTORS" } for kind, collapse in [("communication", 3), ("computation", 1)] }
+
+def best(function, repeats):
+    """Minimal time of `repeats` calls of `function` (called with the repetition index)"""
+    times = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        function(i)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def nodes(expr):
+    return sum(1 for _ in complexity.sympy.preorder_traversal(expr))
+
+def measure(protocols, repeats):
+    """Time of constructing each protocol and rendering each table, and the expression size (number of nodes) of each phase"""
+    results = {}
+    for protocol in protocols:
+        results[f"construction/{protocol}"] = best(lambda _: getattr(complexity, protocol)(), repeats)
+
+    # each rendering gets fresh models, as models keep their sums and polynomials once requested
+    models = pickle.dumps([getattr(complexity, protocol)() for protocol in protocols])
+    copies = [pickle.loads(models) for _ in range(repeats * len(TABLES))]
+    for name, options in TABLES.items():
+        with contextlib.redirect_stdout(io.StringIO()):
+            results[f"table/{name}"] = best(lambda i: complexity.render(copies.pop(), **options), repeats)
+
+    for protocol, model in zip(protocols, pickle.loads(models)):
+        for phase, costs in model.phases.items():
+            expr = complexity.sympy.Add(*costs.communication.communication.values(), *costs.computation.computation.values())
+            results[f"nodes/{protocol}/{phase}"] = nodes(expr)
+    return results
+
+def main(*protocols, repeats=5, baseline="reports/complexity-benchmark.json", threshold=0.25, update=False):
+    """
+    Benchmark the construction of the protocol models, the rendering of tables, and the size of the model expressions against a baseline.
+
+    :param baseline: JSON file of previous results; written if it does not exist yet (or with `--update`).
+    :param threshold: Relative increase over the baseline that counts as regression (e.g., 0.25 for 25%).
+    """
+    if not protocols:
+        protocols = PROTOCOLS
+    results = measure(protocols, repeats)
+
+    try:
+        with open(baseline) as f:
+            previous = json.load(f)
+    except FileNotFoundError:
+        previous = {}
+
+    tsv = writer(sys.stdout, delimiter="\t", quoting=QUOTE_NONE)
+    tsv.writerow(["metric", "baseline", "value", "ratio", "status"])
+    regressions = []
+    for metric, value in results.items():
+        if metric in previous:
+            ratio = value / previous[metric] if previous[metric] else float("inf") if value else 1
+            status = "regression" if ratio > 1 + threshold else "improvement" if ratio < 1 / (1 + threshold) else "ok"
+            if status == "regression":
+                regressions.append(metric)
+            tsv.writerow([metric, previous[metric], value, f"{ratio:.3f}", status])
+        else:
+            tsv.writerow([metric, "", value, "", "new"])
+
+    if update or not previous:
+        if os.path.dirname(baseline):
+            os.makedirs(os.path.dirname(baseline), exist_ok=True)
+        with open(baseline, "tw") as f:
+            json.dump(previous | results, f, indent=4, sort_keys=True)
+
+    if regressions:
+        sys.exit(f"{len(regressions)} regressions (more than {threshold:.0%} over the baseline): {', '.join(regressions)}")
+
+if __name__ == "__main__":
+    import fire
+    fire.Fire(main)
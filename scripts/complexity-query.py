@@ -0,0 +1,173 @@
+"""
+Answer table and summary queries of "complexity.py" from a store of pre-rendered results.
+
+Only the standard library is imported on startup; "complexity.py" (and with it sympy) is imported only if a query is not in the store yet.
+The store is invalidated whenever "complexity.py" or "bgv-parameters.py" changes.
+
+Usage:
+    python3 scripts/complexity-query.py table <protocols...> [--<option>=<value>...]     (same arguments as `complexity.py table`)
+    python3 scripts/complexity-query.py summary <protocols...> [--<option>=<value>...]   (TSV of the total and per-location expressions of each phase)
+    python3 scripts/complexity-query.py precompute <manifest>                           (store the tables of a manifest, see `complexity.py tables`)
+    python3 scripts/complexity-query.py benchmark [--repeats=20] [--threshold=100]      (startup time of cached queries in milliseconds)
+"""
+import ast
+import contextlib
+import hashlib
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+SOURCES = ["complexity.py", "bgv-parameters.py"]
+
+def store_file():
+    return os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "pia-mpc", "complexity", "store.json")
+
+def digest():
+    """Hash of the scripts the stored results are computed by"""
+    h = hashlib.sha256()
+    for source in SOURCES:
+        with open(os.path.join(DIRECTORY, source), "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+def load():
+    try:
+        with open(store_file()) as f:
+            store = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        store = {}
+    if store.get("digest") != digest():
+        store = { "digest" : digest(), "entries" : {} }
+    return store
+
+def save(store):
+    file = store_file()
+    os.makedirs(os.path.dirname(file), exist_ok=True)
+    with open(f"{file}.{os.getpid()}", "tw") as f:
+        json.dump(store, f)
+    os.replace(f"{file}.{os.getpid()}", file)
+
+def parse(args):
+    """Split command line arguments into positional arguments and options (values are parsed as Python literals where possible, like fire does)"""
+    def value(x):
+        try:
+            return ast.literal_eval(x)
+        except (ValueError, SyntaxError):
+            return x
+
+    positional = []
+    options = {}
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg.startswith("--"):
+            key, sep, x = arg[2:].partition("=")
+            key = key.replace("-", "_")
+            if sep:
+                options[key] = value(x)
+            elif i + 1 < len(args) and not args[i + 1].startswith("--"):
+                i += 1
+                options[key] = value(args[i])
+            elif key.startswith("no") and len(key) > 2:
+                options[key[2:]] = False
+            else:
+                options[key] = True
+        else:
+            positional.append(value(arg))
+        i += 1
+    return positional, options
+
+def key(command, positional, options):
+    return json.dumps([command, positional, sorted(options.items())], default=str)
+
+def complexity():
+    """Import "complexity.py" (and with it sympy)"""
+    if DIRECTORY not in sys.path:
+        sys.path.insert(0, DIRECTORY)
+    import complexity
+    return complexity
+
+def render_table(args, positional, options):
+    module = complexity()
+    output = io.StringIO()
+    # the table records the `complexity.py` command that generates it
+    argv = sys.argv
+    sys.argv = [os.path.join(os.path.relpath(DIRECTORY), "complexity.py"), "table", *args]
+    try:
+        with contextlib.redirect_stdout(output):
+            module.table(*positional, **options)
+    finally:
+        sys.argv = argv
+    return output.getvalue()
+
+def render_summary(args, positional, options):
+    module = complexity()
+    output = io.StringIO()
+    for protocol, model in zip(positional, module.models(*positional, **options)):
+        for phase, complexity_ in model.phases.items():
+            print(protocol, phase, "communication", "total", complexity_.communication.total(), sep="\t", file=output)
+            for location, value in complexity_.communication.summary().items():
+                print(protocol, phase, "communication", location, value, sep="\t", file=output)
+            print(protocol, phase, "computation", "total", complexity_.computation.total(), sep="\t", file=output)
+            for location, value in complexity_.computation.summary().items():
+                print(protocol, phase, "computation", location, value, sep="\t", file=output)
+    return output.getvalue()
+
+RENDER = { "table" : render_table, "summary" : render_summary }
+
+def query(command, args):
+    positional, options = parse(args)
+    store = load()
+    entry = key(command, positional, options)
+    if entry not in store["entries"]:
+        print(f"% store miss: {entry}", file=sys.stderr)
+        store["entries"][entry] = RENDER[command](args, positional, options)
+        save(store)
+    return store["entries"][entry]
+
+def precompute(manifest):
+    """Store the tables of a manifest (see `complexity.py tables`)"""
+    with open(manifest) as f:
+        manifest = json.load(f)
+    for entry in manifest:
+        if entry.get("script", "complexity.py") != "complexity.py":
+            continue
+        args = entry["protocols"] + [f"--{k}" if v is True else f"--{k}={v}" for k, v in entry.get("options", {}).items()]
+        query("table", args)
+
+def benchmark(repeats=20, threshold=100, args=["OurProtocol", "--computation", "--collapse=1"]):
+    """
+    Measure the startup time of a cached table query.
+
+    :param threshold: Maximum median time in milliseconds; exceeding it makes the benchmark fail.
+    """
+    command = [sys.executable, os.path.abspath(__file__), "table", *args]
+    subprocess.run(command, check=True, stdout=subprocess.DEVNULL) # fill the store
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    median = times[len(times) // 2]
+    print(f"cached query: min {times[0]:.1f} ms, median {median:.1f} ms, max {times[-1]:.1f} ms (threshold: {threshold} ms)")
+    if median > threshold:
+        sys.exit(f"median startup time {median:.1f} ms exceeds {threshold} ms")
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in ["table", "summary", "precompute", "benchmark"]:
+        sys.exit(__doc__)
+    command, args = sys.argv[1], sys.argv[2:]
+    if command in RENDER:
+        print(query(command, args), end="")
+    elif command == "precompute":
+        precompute(*args)
+    else:
+        positional, options = parse(args)
+        if "args" in options and isinstance(options["args"], str):
+            options["args"] = options["args"].split()
+        benchmark(*positional, **options)
@@ -1,6 +1,23 @@
+from concurrent.futures import ProcessPoolExecutor
+from csv import QUOTE_NONE, reader, writer
+from functools import cache
+from itertools import product
+import ast
+import contextlib
+import hashlib
+import importlib.util
+import inspect
+import json
+import math
+import numpy
+import os
+import pickle
+import platform
+import re
 import sympy
 import sys
 import shlex
+import time
 try:
     from typing import Self
 except ImportError:
@@ -19,6 +36,10 @@ OUTPUT_PARTY = "output_party"
 BULLETIN_BOARD = "bulletin_board"
 ANY_PARTY = "any_party"
 
+PHASES = [SETUP_PHASE, OFFLINE_PHASE, ONLINE_PHASE, VERIFICATION_PHASE]
+PARTIES = [COMPUTE_PARTY, INPUT_PARTY, OUTPUT_PARTY]
+RECEIVERS = PARTIES + [BULLETIN_BOARD]
+
 COMPUTE_PARTY_COUNT = sympy.Symbol("n")
 INPUT_PARTY_COUNT = sympy.Symbol("nI")
 OUTPUT_PARTY_COUNT = sympy.Symbol("nO")
@@ -28,6 +49,8 @@ SCALAR_MULTIPLICATION_COUNT = sympy.Symbol("S")
 MULTIPLICATION_COUNT = sympy.Symbol("M", positive=True)
 PUBLIC_OUTPUT_COUNT = sympy.Symbol("publicO", positive=True)
 PRIVATE_OUTPUT_COUNT = sympy.Symbol("privateO", positive=True)
+MULTIPLICATION_DEPTH = sympy.Symbol("D", positive=True) # only used for rounds
+WORKLOAD = [COMPUTE_PARTY_COUNT, INPUT_PARTY_COUNT, OUTPUT_PARTY_COUNT, INPUT_COUNT, ADDITION_COUNT, SCALAR_MULTIPLICATION_COUNT, MULTIPLICATION_COUNT, PUBLIC_OUTPUT_COUNT, PRIVATE_OUTPUT_COUNT]
 
 BOOLEAN_ELEMENT = sympy.Symbol("bool")
 FIELD_ELEMENT = sympy.Symbol("field")
@@ -49,44 +72,279 @@ COMMITMENT_ZK = sympy.Symbol("commitment_ZK")
 
 
 def conditional(choice, true=1, false=0):
+    if isinstance(choice, bool): # concrete workload
+        return true if choice else false
     return sympy.Piecewise((true, choice), (false, True))
 
 
+class SimplificationCache:
+    """Memoizes `sympy.simplify` keyed by the expression to simplify"""
+    def __init__(self):
+        self.cache = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, expr):
+        try:
+            result = self.cache[expr]
+            self.hits += 1
+        except KeyError:
+            result = sympy.simplify(expr)
+            self.cache[expr] = result
+            self.misses += 1
+        return result
+
+    def clear(self):
+        self.cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __str__(self):
+        return f"{self.hits} hits, {self.misses} misses, {len(self.cache)} entries"
+
+simplify = SimplificationCache()
+
+
+ELEMENTS = [BOOLEAN_ELEMENT, FIELD_ELEMENT, CIPHERTEXT_FIELD_ELEMENT, CIPHERTEXT_ELEMENT, COMMITMENT_ELEMENT, DECOMMITMENT, DISTRIBUTED_DECRYPTION, ZK, PUBLIC_KEY_ZK, COMMITMENT_ZK]
+ELEMENTS += [sympy.Symbol(f"public_random_{x}") for x in ELEMENTS]
+
+class Polynomial:
+    """
+    Sparse polynomial over the workload (`WORKLOAD` and their logarithms) for asymptotic (O-notation) output.
+
+    Elements (`ELEMENTS`) count as 1 (i.e., only their number matters).
+    Coefficients are kept by monomial of the workload, a tuple of (exponent, exponent of the logarithm) per workload symbol, and by the remaining factors (operations, constants).
+    The maximal monomials (with respect to asymptotic growth) are kept as Pareto frontier which is updated incrementally.
+    """
+    __slots__ = ("coefficients", "frontier")
+
+    def __init__(self):
+        self.coefficients = {} # workload monomial -> remaining factors -> rational coefficient
+        self.frontier = set() # workload monomials not dominated by others
+
+    @staticmethod
+    def dominates(x, y):
+        return all(a >= b for a, b in zip(x, y))
+
+    @staticmethod
+    @cache
+    def monomials(expr):
+        """(workload monomial, remaining factors, coefficient) of the expanded `expr`"""
+        result = []
+        for monomial, coefficient in sympy.expand(expr).as_coefficients_dict().items():
+            exponents = [[0, 0] for _ in WORKLOAD]
+            rest = []
+            for base, exponent in monomial.as_powers_dict().items():
+                if base in WORKLOAD:
+                    exponents[WORKLOAD.index(base)][0] += exponent
+                elif isinstance(base, sympy.log) and base.args[0] in WORKLOAD:
+                    exponents[WORKLOAD.index(base.args[0])][1] += exponent
+                elif base not in ELEMENTS and base != 1:
+                    rest.append((base, exponent))
+            result.append((tuple(map(tuple, exponents)), frozenset(rest), coefficient))
+        return tuple(result)
+
+    def __iadd__(self, expr):
+        for monomial, rest, coefficient in self.monomials(expr):
+            self.add(monomial, rest, coefficient)
+        return self
+
+    def add(self, monomial, rest, coefficient):
+        coefficients = self.coefficients.setdefault(monomial, {})
+        coefficient += coefficients.pop(rest, 0)
+        if coefficient != 0:
+            coefficients[rest] = coefficient
+            self.insert(monomial)
+        elif not coefficients:
+            del self.coefficients[monomial]
+            if monomial in self.frontier: # cancelled; monomials dominated by it may be maximal now
+                self.frontier = set()
+                for other in self.coefficients:
+                    self.insert(other)
+
+    def insert(self, monomial):
+        if monomial in self.frontier or any(self.dominates(other, monomial) for other in self.frontier):
+            return
+        self.frontier = { other for other in self.frontier if not self.dominates(monomial, other) }
+        self.frontier.add(monomial)
+
+    def __add__(self, other):
+        if isinstance(other, int) and other == 0:
+            return self
+        result = Polynomial()
+        result.coefficients = { monomial : dict(coefficients) for monomial, coefficients in self.coefficients.items() }
+        result.frontier = set(self.frontier)
+        for monomial, coefficients in other.coefficients.items():
+            for rest, coefficient in coefficients.items():
+                result.add(monomial, rest, coefficient)
+        return result
+    __radd__ = __add__
+
+    def dominant(self):
+        """Sum of the maximal monomials without constant factors"""
+        result = 0
+        for monomial in self.frontier:
+            y = 1
+            for var, (exponent, log_exponent) in zip(WORKLOAD, monomial):
+                y *= var ** exponent
+                y *= sympy.log(var) ** log_exponent
+            result += y
+        return result
+
+    def degree(self, var):
+        """Maximal exponent of `var`"""
+        return max([monomial[WORKLOAD.index(var)][0] for monomial in self.frontier] + [0])
+
+
+class Counts(dict):
+    """
+    Number of each operation or element (by name) for the numeric backend (see `Protocol_numeric`).
+
+    Counts are integers unless a model divides or takes logarithms of the workload.
+    """
+    __slots__ = ()
+
+    @staticmethod
+    def of(x):
+        """Counts of a single operation or element (`sympy.Symbol`)"""
+        return Counts({ x.name : 1 })
+
+    def __add__(self, other):
+        if isinstance(other, Counts):
+            result = Counts(self)
+            for name, count in other.items():
+                result[name] = result.get(name, 0) + count
+            return result
+        elif isinstance(other, int) and other == 0:
+            return self
+        else:
+            return NotImplemented
+    __radd__ = __add__
+
+    def __mul__(self, other):
+        if isinstance(other, (int, float)):
+            return Counts({ name : count * other for name, count in self.items() }) if other != 0 else 0
+        else:
+            return NotImplemented
+    __rmul__ = __mul__
+
+    def as_expr(self):
+        return sympy.Add(*[count * sympy.Symbol(name) for name, count in self.items()])
+
+    def evaluate(self, weights={}):
+        """Weighted sum of the counts (weights by name, default 1)"""
+        return sum(count * weights.get(name, 1) for name, count in self.items())
+
+
+def operation(name):
+    """A single operation (as `Counts` for the numeric backend)"""
+    return Counts({ name : 1 }) if Protocol_numeric else sympy.Symbol(name)
+
+def workload(value):
+    """A workload parameter as sympy expression (or as integer for the numeric backend)"""
+    if Protocol_numeric:
+        if not isinstance(value, int):
+            raise ValueError(f"The numeric backend requires integer workloads (got {value!r})")
+        return value
+    return sympy.simplify(value)
+
+def accumulate(terms):
+    """Sum up a ledger of amounts"""
+    if any(isinstance(term, Counts) for term in terms):
+        return sum(terms, Counts())
+    return sympy.Add(*terms)
+
+
 class Communication:
     def __init__(self, source, destination, amount):
         self.source = source
         self.destination = destination
         try:
             assert amount.expr == 0
-            self.amount = amount.count * amount.what
+            self.amount = amount.count * (Counts.of(amount.what) if Protocol_numeric else amount.what)
         except AttributeError:
             self.amount = amount
 
-        assert isinstance(self.amount, (sympy.Expr, int)), type(self.amount)
+        assert isinstance(self.amount, (sympy.Expr, int, float, Counts)), type(self.amount)
 
 
+Complexity_deferred_accumulation = True # append costs to a ledger and only sum them up when they are requested
 class CommunicationComplexity:
-    def __init__(self):
-        self.communication = {}
+    """Communication as matrix indexed by source (`PARTIES`) and destination (`RECEIVERS`)"""
+    __slots__ = ("deferred", "terms", "materialized", "simplified", "polynomials")
+
+    def __init__(self, deferred=None):
+        if deferred is None:
+            deferred = Complexity_deferred_accumulation
+        self.deferred = deferred
+        self.terms = numpy.empty((len(PARTIES), len(RECEIVERS)), dtype=object) # ledger of amounts (or `None`) by source and destination
+        self.materialized = None # summed up amounts
+        self.simplified = {} # simplified amounts by (source, destination); `None` for the total
+        self.polynomials = numpy.empty(self.terms.shape, dtype=object) # amounts as polynomials (or `None` if not requested yet)
 
     def __iadd__(self, communication : Communication) -> Self:
-        try:
-            self.communication[(communication.source, communication.destination)] += communication.amount
-        except LookupError:
-            self.communication[(communication.source, communication.destination)] = communication.amount
-            setattr(CommunicationComplexity, communication.source + "_to_" + communication.destination, property(lambda x: sympy.simplify(x.communication.get((communication.source, communication.destination), 0))))
+        key = (communication.source, communication.destination)
+        index = (PARTIES.index(communication.source), RECEIVERS.index(communication.destination))
+        if self.polynomials[index] is not None:
+            self.polynomials[index] += communication.amount
+        terms = self.terms[index]
+        if terms is None:
+            self.terms[index] = [communication.amount]
+        elif self.deferred:
+            terms.append(communication.amount)
+        else:
+            terms[0] += communication.amount
+        self.materialized = None
+        self.simplified.pop(key, None)
+        self.simplified.pop(None, None)
 
         return self
 
+    @property
+    def matrix(self):
+        if self.materialized is None:
+            self.materialized = numpy.zeros(self.terms.shape, dtype=object)
+            for index, terms in numpy.ndenumerate(self.terms):
+                if terms is not None:
+                    self.materialized[index] = accumulate(terms)
+        return self.materialized
+
+    @property
+    def polynomial(self):
+        """Amounts as `Polynomial` (kept up to date once requested)"""
+        for index, polynomial in numpy.ndenumerate(self.polynomials):
+            if polynomial is None:
+                polynomial = self.polynomials[index] = Polynomial()
+                for amount in self.terms[index] or []:
+                    polynomial += amount
+        return self.polynomials
+
+    @property
+    def communication(self):
+        matrix = self.matrix
+        return { (source, destination) : matrix[i, j] for i, source in enumerate(PARTIES) for j, destination in enumerate(RECEIVERS) if self.terms[i, j] is not None }
+
+    def simplify(self, key):
+        try:
+            return self.simplified[key]
+        except KeyError:
+            if key is None:
+                value = simplify(self.matrix.sum())
+            else:
+                source, destination = key
+                value = simplify(self.matrix[PARTIES.index(source), RECEIVERS.index(destination)])
+            self.simplified[key] = value
+            return value
+
     def update(self, other : Self):
         for (source, destination), amount in other.communication.items():
             self += Communication(source, destination, amount)
 
     def summary(self):
-        return { f"{source}_to_{destination}" : sympy.simplify(v) for (source, destination), v in self.communication.items() }
+        return { f"{source}_to_{destination}" : self.simplify((source, destination)) for source, destination in self.communication }
 
     def total(self):
-        return sympy.simplify(sympy.Add(*self.communication.values()))
+        return self.simplify(None)
 
 
 class Computation:
@@ -97,31 +355,84 @@ class Computation:
         except AttributeError:
             self.amount = amount
 
-        assert isinstance(self.amount, (sympy.Expr, int)), type(self.amount)
+        assert isinstance(self.amount, (sympy.Expr, int, float, Counts)), type(self.amount)
 
 
 class ComputationComplexity:
-    def __init__(self):
-        self.computation = {}
+    """Computation as vector indexed by location (`PARTIES`)"""
+    __slots__ = ("deferred", "terms", "materialized", "simplified", "polynomials")
+
+    def __init__(self, deferred=None):
+        if deferred is None:
+            deferred = Complexity_deferred_accumulation
+        self.deferred = deferred
+        self.terms = numpy.empty(len(PARTIES), dtype=object) # ledger of amounts (or `None`) by location
+        self.materialized = None # summed up amounts
+        self.simplified = {} # simplified amounts by location; `None` for the total
+        self.polynomials = numpy.empty(self.terms.shape, dtype=object) # amounts as polynomials (or `None` if not requested yet)
 
     def __iadd__(self, computation : Computation) -> Self:
-        try:
-            self.computation[computation.location] += computation.amount
-        except LookupError:
-            self.computation[computation.location] = computation.amount
-            setattr(ComputationComplexity, computation.location, property(lambda x: sympy.simplify(x.computation.get(computation.location, 0))))
+        key = computation.location
+        index = PARTIES.index(key)
+        if self.polynomials[index] is not None:
+            self.polynomials[index] += computation.amount
+        terms = self.terms[index]
+        if terms is None:
+            self.terms[index] = [computation.amount]
+        elif self.deferred:
+            terms.append(computation.amount)
+        else:
+            terms[0] += computation.amount
+        self.materialized = None
+        self.simplified.pop(key, None)
+        self.simplified.pop(None, None)
 
         return self
 
+    @property
+    def matrix(self):
+        if self.materialized is None:
+            self.materialized = numpy.zeros(self.terms.shape, dtype=object)
+            for index, terms in enumerate(self.terms):
+                if terms is not None:
+                    self.materialized[index] = accumulate(terms)
+        return self.materialized
+
+    @property
+    def polynomial(self):
+        """Amounts as `Polynomial` (kept up to date once requested)"""
+        for index, polynomial in enumerate(self.polynomials):
+            if polynomial is None:
+                polynomial = self.polynomials[index] = Polynomial()
+                for amount in self.terms[index] or []:
+                    polynomial += amount
+        return self.polynomials
+
+    @property
+    def computation(self):
+        matrix = self.matrix
+        return { location : matrix[index] for index, location in enumerate(PARTIES) if self.terms[index] is not None }
+
+    def simplify(self, key):
+        try:
+            return self.simplified[key]
+        except KeyError:
+            if key is None:
+                value = simplify(self.matrix.sum())
+            else:
+                value = simplify(self.matrix[PARTIES.index(key)])
+            self.simplified[key] = value
+            return value
+
     def update(self, other : Self):
         for location, amount in other.computation.items():
             self += Computation(location, amount)
 
     def summary(self):
-        return { k : sympy.simplify(v) for k, v in self.computation.items() }
+        return { k : self.simplify(k) for k in self.computation }
 
     def total(self):
-        return sympy.simplify(sympy.Add(*self.computation.values()))
+        return self.simplify(None)
 
 
 class Arithmetic:
@@ -132,23 +443,23 @@ class Arithmetic:
     def add(self, other : Self, result):
         assert self.count == other.count
         if self.what == other.what:
-            return result(self.expr + other.expr + sympy.var(f"{self.what}_addition"), self.count)
+            return result(self.expr + other.expr + operation(f"{self.what.name}_addition"), self.count)
         else:
-            return result(self.expr + other.expr + sympy.var(f"{self.what}_{other.what}_addition"), self.count)
+            return result(self.expr + other.expr + operation(f"{self.what.name}_{other.what.name}_addition"), self.count)
 
     sub = add
 
     def sum(self, count):
-        return type(self)(self.expr + (count - 1) * sympy.var(f"{self.what}_addition"), self.count)
+        return type(self)(self.expr + (count - 1) * operation(f"{self.what.name}_addition"), self.count)
 
     def mul(self, other, result):
         try:
             if self.what == other.what:
                 assert self.count == other.count
-                return result(self.expr + other.expr + sympy.var(f"{self.what}_multiplication"), self.count)
+                return result(self.expr + other.expr + operation(f"{self.what.name}_multiplication"), self.count)
             else:
                 assert self.count == other.count
-                return result(self.expr + other.expr + sympy.var(f"{self.what}_{other.what}_multiplication"), self.count)
+                return result(self.expr + other.expr + operation(f"{self.what.name}_{other.what.name}_multiplication"), self.count)
         except AttributeError:
             if self.expr == 0:
                 return result(self.expr, other * self.count)
@@ -158,18 +469,18 @@ class Arithmetic:
     def __eq__(self, other):
         assert self.count == other.count
         assert self.what == other.what
-        return Boolean(self.expr + other.expr + sympy.var(f"{self.what}_equality"), self.count)
+        return Boolean(self.expr + other.expr + operation(f"{self.what.name}_equality"), self.count)
     __ne__ = __eq__
 
     def sample(self):
-        return type(self)(sympy.Symbol(f"{self.what}_sampling"), self.count)
+        return type(self)(operation(f"{self.what.name}_sampling"), self.count)
 
 
 class Boolean(Arithmetic):
     what = BOOLEAN_ELEMENT
 
     def __mul__(self, other):
-        if isinstance(other, (sympy.Expr, int)):
+        if isinstance(other, (sympy.Expr, int, float)):
             return super().mul(other, Boolean)
         else:
             return NotImplemented
@@ -190,7 +501,7 @@ class Field(Arithmetic):
     __rsub__ = __sub__
 
     def __mul__(self, other):
-        if isinstance(other, (Field, sympy.Expr, int)):
+        if isinstance(other, (Field, sympy.Expr, int, float)):
             return super().mul(other, Field)
         else:
             return NotImplemented
@@ -211,7 +522,7 @@ class CiphertextField(Arithmetic):
     __rsub__ = __sub__
 
     def __mul__(self, other):
-        if isinstance(other, (CiphertextField, Field, sympy.Expr, int)):
+        if isinstance(other, (CiphertextField, Field, sympy.Expr, int, float)):
             return super().mul(other, CiphertextField)
         else:
             return NotImplemented
@@ -220,7 +531,7 @@ class CiphertextField(Arithmetic):
     def __mod__(self, other):
         assert isinstance(other, Field)
         assert self.count == other.count
-        return Field(self.expr + other.expr + sympy.var(f"{self.what}_mod_{other.what}"), self.count)
+        return Field(self.expr + other.expr + operation(f"{self.what.name}_mod_{other.what.name}"), self.count)
 
 CIPHERTEXT_FIELD = CiphertextField()
 
@@ -238,7 +549,7 @@ class Ciphertext(Arithmetic):
     __rsub__ = __sub__
 
     def __mul__(self, other):
-        if isinstance(other, (Ciphertext, Field, sympy.Expr, int)):
+        if isinstance(other, (Ciphertext, Field, sympy.Expr, int, float)):
             return super().mul(other, Ciphertext)
         else:
             return NotImplemented
@@ -260,7 +571,7 @@ class Commitment(Arithmetic):
     __rsub__ = __sub__
 
     def __mul__(self, other):
-        if isinstance(other, (Field, sympy.Expr, int)):
+        if isinstance(other, (Field, sympy.Expr, int, float)):
             return super().mul(other, Commitment)
         else:
             return NotImplemented
@@ -269,10 +580,33 @@ class Commitment(Arithmetic):
 COMMITMENT = Commitment()
 
 
+class Rounds:
+    """Communication rounds as tree of sequential (rounds add up) and parallel (maximum rounds) parts"""
+    __slots__ = ("parallel", "count", "children")
+
+    def __init__(self, parallel=False, count=1):
+        self.parallel = parallel
+        self.count = count # number of sequential repetitions
+        self.children = [] # rounds (`Rounds` or numbers)
+
+    def add(self, child):
+        self.children.append(child)
+        return child
+
+    def total(self):
+        values = [child.total() if isinstance(child, Rounds) else child for child in self.children]
+        if self.parallel:
+            return sympy.Max(*values) if values else 0
+        return self.count * sympy.Add(*values)
+
+
 class Complexity:
-    def __init__(self):
-        self.communication = CommunicationComplexity()
-        self.computation = ComputationComplexity()
+    __slots__ = ("communication", "computation", "rounds")
+
+    def __init__(self, deferred=None):
+        self.communication = CommunicationComplexity(deferred)
+        self.computation = ComputationComplexity(deferred)
+        self.rounds = Rounds()
 
     def __iadd__(self, complexity : Communication | Computation) -> Self:
         if isinstance(complexity, Communication):
@@ -287,6 +621,7 @@ class Complexity:
     def update(self, other : Self):
         self.communication.update(other.communication)
         self.computation.update(other.computation)
+        self.rounds.add(other.rounds)
 
 
 class CombinedManager:
@@ -303,12 +638,33 @@ class CombinedManager:
 combine = CombinedManager
 
 
+Protocol_attribution = False # record the methods and contexts each cost stems from (see `attribution`)
+Protocol_numeric = False # count operations as `Counts` instead of sympy expressions (requires integer workloads)
 class Protocol:
-    def __init__(self):
+    options = {} # scenario options (and their defaults), set as attributes of the same name
+
+    def __init__(self, input_party=INPUT_PARTY, output_party=OUTPUT_PARTY, **options):
+        """
+        :param input_party: Role of the parties providing inputs (`INPUT_PARTY` or `COMPUTE_PARTY`).
+        :param output_party: Role of the parties receiving outputs (`OUTPUT_PARTY` or `COMPUTE_PARTY`).
+        :param options: Values for the scenario options of the protocol (see `options`).
+        """
+        unknown = options.keys() - self.options.keys()
+        if unknown:
+            raise ValueError(f"Unknown options of {type(self).__name__}: {', '.join(sorted(unknown))}")
+        for name, default in self.options.items():
+            setattr(self, name, options.get(name, default))
+        self.input_party = PARTIES[PARTIES.index(input_party)]
+        self.output_party = PARTIES[PARTIES.index(output_party)]
         self.phases = {}
         self.current_phase = None
         self.current_party = None
         self.factor = 1
+        self.events = 0 # number of recorded communication and computation events
+        self.contexts = [] # (frame, label) of the active context managers
+        self.attribution = [] if Protocol_attribution else None # (stack, kind, amount) of each event
+        self.round = None # current part of the rounds of the current phase
+        self.previous_rounds = [] # parts of the rounds before the active context managers
 
     @property
     def phase(self):
@@ -320,13 +676,83 @@ class Protocol:
     def party(self):
         return self.current_party
 
+    def communication_matrix(self, phases=PHASES, polynomials=False):
+        """Communication indexed by phase (of `phases`), source (`PARTIES`), and destination (`RECEIVERS`); as `Polynomial` if `polynomials` is set"""
+        empty = CommunicationComplexity()
+        return numpy.stack([(complexity.polynomial if polynomials else complexity.matrix) for complexity in (self.phases[phase].communication if phase in self.phases else empty for phase in phases)])
+
+    def computation_matrix(self, phases=PHASES, polynomials=False):
+        """Computation indexed by phase (of `phases`) and location (`PARTIES`); as `Polynomial` if `polynomials` is set"""
+        empty = ComputationComplexity()
+        return numpy.stack([(complexity.polynomial if polynomials else complexity.matrix) for complexity in (self.phases[phase].computation if phase in self.phases else empty for phase in phases)])
+
     def communicate(self, destination, amount, factor=1):
         assert self.party is not None
-        self.phase += Communication(self.party, destination, self.factor * amount * factor)
+        if Protocol_numeric and isinstance(amount, sympy.Symbol):
+            amount = Counts.of(amount)
+        communication = Communication(self.party, destination, self.factor * amount * factor)
+        self.phase += communication
+        self.events += 1
+        if communication.amount != 0:
+            self.round.add(1) # each message waits for the messages before it (use `in_parallel` for independent messages)
+        if self.attribution is not None:
+            self.attribution.append((self.stack() + (f"to_{destination}",), "communication", communication.amount))
 
     def compute(self, amount, factor=1):
         assert self.party is not None
-        self.phase += Computation(self.party, self.factor * amount * factor)
+        if Protocol_numeric and isinstance(amount, sympy.Symbol):
+            amount = Counts.of(amount)
+        computation = Computation(self.party, self.factor * amount * factor)
+        self.phase += computation
+        self.events += 1
+        if self.attribution is not None:
+            self.attribution.append((self.stack(), "computation", computation.amount))
+
+    def caller(self):
+        """Innermost frame of a method of this protocol (outside of the context managers)"""
+        frame = sys._getframe(2)
+        while frame is not None and frame.f_locals.get("self") is not self:
+            frame = frame.f_back
+        return frame
+
+    def enter(self, label, rounds=None):
+        if self.attribution is not None:
+            self.contexts.append((self.caller(), label))
+        self.previous_rounds.append(self.round)
+        if rounds is not None:
+            self.round = self.round.add(rounds)
+        elif self.round is not None and self.round.parallel: # each context in a parallel part is a parallel branch
+            self.round = self.round.add(Rounds())
+
+    def exit(self):
+        if self.attribution is not None:
+            self.contexts.pop()
+        self.round = self.previous_rounds.pop()
+
+    def rounds(self, phase):
+        """Number of communication rounds of the phase"""
+        try:
+            return self.phases[phase].rounds.total()
+        except KeyError:
+            return 0
+
+    def stack(self):
+        """Methods of this protocol and labels of the contexts entered in them that lead to the current event"""
+        frames = []
+        frame = sys._getframe(2) # caller of `communicate` or `compute`
+        while frame is not None:
+            if frame.f_locals.get("self") is self:
+                frames.append(frame)
+            frame = frame.f_back
+        labels = {}
+        for frame, label in self.contexts:
+            if label is not None:
+                labels.setdefault(id(frame), []).append(label)
+        stack = [type(self).__name__]
+        for frame in reversed(frames):
+            stack.append(frame.f_code.co_name)
+            stack.extend(labels.get(id(frame), []))
+        return tuple(stack)
 
     def in_phase(self, phase):
         try:
@@ -342,7 +768,19 @@ class Protocol:
         return combine(ProtocolPartyManager(party, self), ProtocolFactorManager(party_count, self))
 
     def for_each(self, *what):
-        return ProtocolFactorManager(sympy.Mul(*what), self)
+        return ProtocolFactorManager(math.prod(what) if Protocol_numeric else sympy.Mul(*what), self)
+
+    def in_parallel(self):
+        """Communication in this context happens in parallel instead of in sequence: each message and each context directly in it is a branch"""
+        return ProtocolRoundsManager(Rounds(parallel=True), self)
+
+    def in_branch(self):
+        """Rounds in this context add up, e.g., for a branch of `in_parallel` with several steps"""
+        return ProtocolRoundsManager(Rounds(), self)
+
+    def in_sequence(self, count):
+        """Rounds in this context are repeated `count` times in sequence (instead of in parallel as for `for_each`)"""
+        return ProtocolRoundsManager(Rounds(count=count), self)
 
     def if_conditionally(self, condition, true=1, false=0):
         return ProtocolFactorManager(conditional(condition, true, false), self)
@@ -427,8 +865,11 @@ class ProtocolPhaseManager:
 
         self.previous_phase = self.protocol.current_phase
         self.protocol.current_phase = self.phase
+        self.protocol.enter(self.phase)
+        self.protocol.round = self.protocol.phase.rounds
 
     def __exit__(self, exc_type, exc_value, traceback):
+        self.protocol.exit()
         self.protocol.current_phase = self.previous_phase
         del self.previous_phase
 
@@ -447,8 +888,10 @@ class ProtocolPartyManager:
 
         self.previous_party = self.protocol.current_party
         self.protocol.current_party = self.party
+        self.protocol.enter(f"at_{self.party}")
 
     def __exit__(self, exc_type, exc_value, traceback):
+        self.protocol.exit()
         self.protocol.current_party = self.previous_party
         del self.previous_party
 
@@ -467,12 +910,26 @@ class ProtocolFactorManager:
 
         self.previous_factor = self.protocol.factor
         self.protocol.factor *= self.factor
+        self.protocol.enter(None if self.factor == 1 else f"for_each({self.factor})".replace(" ", ""))
 
     def __exit__(self, exc_type, exc_value, traceback):
+        self.protocol.exit()
         self.protocol.factor = self.previous_factor
         del self.previous_factor
 
 
+class ProtocolRoundsManager:
+    def __init__(self, rounds, protocol : Protocol):
+        self.rounds = rounds
+        self.protocol = protocol
+
+    def __enter__(self):
+        self.protocol.enter(None, self.rounds)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.protocol.exit()
+
+
 class SPDZLike(Protocol):
     def AddShare(self):
         assert self.party is COMPUTE_PARTY
@@ -515,8 +972,9 @@ class SPDZLike(Protocol):
         with self.at_each_party(COMPUTE_PARTY, self.parties):
             self.compute(FIELD.sum(self.parties) != FIELD)
 
-OurProtocol_delayed_output=True
 class OurProtocol(Protocol):
+    options = { "delayed_output" : True }
+
     def prf(self):
         self.compute(PRF_EVALUATION)
 
@@ -602,7 +1060,7 @@ class OurProtocol(Protocol):
 
     def prepare_input(self):
         assert self.party is None
-        if INPUT_PARTY == COMPUTE_PARTY:
+        if self.input_party == COMPUTE_PARTY:
             with self.at_party(COMPUTE_PARTY):
                 with self.for_each(self.parties):
                     self.compute(FIELD.sample())
@@ -640,10 +1098,10 @@ class OurProtocol(Protocol):
 
     def input(self):
         assert self.party is None
-        if INPUT_PARTY != COMPUTE_PARTY:
-            self.open_to(INPUT_PARTY)
+        if self.input_party != COMPUTE_PARTY:
+            self.open_to(self.input_party)
 
-        with self.at_party(INPUT_PARTY):
+        with self.at_party(self.input_party):
             self.compute(FIELD - FIELD)
             self.broadcast(FIELD)
         with self.at_party(COMPUTE_PARTY): # only one party has to add the mask to their share
@@ -651,7 +1109,7 @@ class OurProtocol(Protocol):
 
     def verify_input(self):
         assert self.party is None
-        self.verify_open_to(INPUT_PARTY)
+        self.verify_open_to(self.input_party)
 
     def multiply(self):
         assert self.party is None
@@ -688,7 +1146,7 @@ class OurProtocol(Protocol):
             with self.at_each_party(COMPUTE_PARTY, self.parties):
                 self.compute(FIELD - FIELD, 2) # for each component of the authenticated share
         self.open()
-        if OurProtocol_delayed_output:
+        if self.delayed_output:
             with self.if_conditionally(self.is_non_linear):
                 self.open(encrypted=True)
 
@@ -696,7 +1154,7 @@ class OurProtocol(Protocol):
         assert self.party is None
         self.verify_open()
         with self.if_conditionally(self.is_non_linear):
-            if OurProtocol_delayed_output:
+            if self.delayed_output:
                 self.finish_open(encrypted=True)
             else:
                 self.open()
@@ -710,50 +1168,51 @@ class OurProtocol(Protocol):
             with self.at_each_party(COMPUTE_PARTY, self.parties):
                 self.compute(FIELD - FIELD, 2) # for each component of the authenticated share
             self.open()
-            if OurProtocol_delayed_output:
-                self.open_to(OUTPUT_PARTY, encrypted=True)
+            if self.delayed_output:
+                self.open_to(self.output_party, encrypted=True)
         with self.else_conditionally(self.is_non_linear): # directly open for linear circuits
-            self.open_to(OUTPUT_PARTY)
+            self.open_to(self.output_party)
 
     def finish_private_output(self):
         assert self.party is None
         with self.if_conditionally(self.is_non_linear): # open(x - r) for non-linear circuits
             self.verify_open()
-            if OurProtocol_delayed_output:
-                self.finish_open_to(OUTPUT_PARTY, encrypted=True)
+            if self.delayed_output:
+                self.finish_open_to(self.output_party, encrypted=True)
             else:
-                self.open_to(OUTPUT_PARTY)
-        self.verify_open_to(OUTPUT_PARTY)
+                self.open_to(self.output_party)
+        self.verify_open_to(self.output_party)
         with self.if_conditionally(self.is_non_linear):
-            with self.at_party(OUTPUT_PARTY):
+            with self.at_party(self.output_party):
                 self.compute(FIELD + FIELD)
 
-    def __init__(self, parties=COMPUTE_PARTY_COUNT, input_parties=INPUT_PARTY_COUNT, output_parties=OUTPUT_PARTY_COUNT, inputs=INPUT_COUNT, additions=ADDITION_COUNT, scalar_multiplications=SCALAR_MULTIPLICATION_COUNT, multiplications=MULTIPLICATION_COUNT, public_outputs=PUBLIC_OUTPUT_COUNT, private_outputs=PRIVATE_OUTPUT_COUNT):
-        super().__init__()
-        self.parties = sympy.simplify(parties)
-        self.input_parties = sympy.simplify(input_parties)
-        self.output_parties = sympy.simplify(output_parties)
-        self.inputs = sympy.simplify(inputs)
-        self.additions = sympy.simplify(additions)
-        self.scalar_multiplications = sympy.simplify(scalar_multiplications)
-        self.multiplications = sympy.simplify(multiplications)
-        self.public_outputs = sympy.simplify(public_outputs)
-        self.private_outputs = sympy.simplify(private_outputs)
+    def __init__(self, parties=COMPUTE_PARTY_COUNT, input_parties=INPUT_PARTY_COUNT, output_parties=OUTPUT_PARTY_COUNT, inputs=INPUT_COUNT, additions=ADDITION_COUNT, scalar_multiplications=SCALAR_MULTIPLICATION_COUNT, multiplications=MULTIPLICATION_COUNT, public_outputs=PUBLIC_OUTPUT_COUNT, private_outputs=PRIVATE_OUTPUT_COUNT, input_party=INPUT_PARTY, output_party=OUTPUT_PARTY, **options):
+        super().__init__(input_party, output_party, **options)
+        self.parties = workload(parties)
+        self.input_parties = workload(input_parties)
+        self.output_parties = workload(output_parties)
+        self.inputs = workload(inputs)
+        self.additions = workload(additions)
+        self.scalar_multiplications = workload(scalar_multiplications)
+        self.multiplications = workload(multiplications)
+        self.public_outputs = workload(public_outputs)
+        self.private_outputs = workload(private_outputs)
         self.is_non_linear = (self.multiplications > 0)
 
         with combine(self.in_phase(SETUP_PHASE), self.at_each_party(COMPUTE_PARTY, self.parties)):
             # TODO: setup for public key cryptography, signatures, etc.
             # 3: MAC key share, PRF key, PRNG key
-            self.compute(FIELD.sample(), 3)
-            self.commit(3)
-            with self.if_conditionally(self.is_non_linear):
+            with self.in_parallel(): # both sets of keys are committed to at once
                 self.compute(FIELD.sample(), 3)
                 self.commit(3)
+                with self.if_conditionally(self.is_non_linear):
+                    self.compute(FIELD.sample(), 3)
+                    self.commit(3)
 
-        with self.in_phase(OFFLINE_PHASE):
+        with combine(self.in_phase(OFFLINE_PHASE), self.in_parallel()): # inputs, multiplications, and outputs are prepared independently
             with self.for_each(self.inputs):
                 self.prepare_input()
-            with self.if_conditionally(self.is_non_linear):
+            with combine(self.if_conditionally(self.is_non_linear), self.in_parallel()):
                 with self.for_each(self.multiplications):
                     self.prepare_multiplication()
                 with self.for_each(self.private_outputs + self.public_outputs):
@@ -770,13 +1229,14 @@ class OurProtocol(Protocol):
                 with self.for_each(self.scalar_multiplications):
                     self.compute(FIELD * FIELD, 2) # for each component of the authenticated share
             # multiplications
-            with self.for_each(self.multiplications):
+            with combine(self.for_each(self.multiplications), self.in_sequence(MULTIPLICATION_DEPTH)):
                 self.multiply()
             # outputs
-            with self.for_each(self.private_outputs):
-                self.private_output()
-            with self.for_each(self.public_outputs):
-                self.public_output()
+            with self.in_parallel():
+                with self.for_each(self.private_outputs):
+                    self.private_output()
+                with self.for_each(self.public_outputs):
+                    self.public_output()
 
         with self.in_phase(VERIFICATION_PHASE):
             # open setup keys
@@ -810,13 +1270,14 @@ class OurProtocol(Protocol):
             with self.for_each(self.multiplications):
                 self.verify_multiply()
 
-            if OurProtocol_delayed_output: # send decryption keys
-                with self.if_conditionally(self.public_outputs > 0):
-                    with self.at_each_party(COMPUTE_PARTY, self.parties):
-                        self.broadcast(FIELD)
-                with self.if_conditionally(self.private_outputs > 0):
-                    with self.at_each_party(COMPUTE_PARTY, self.parties):
-                        self.communicate(OUTPUT_PARTY, FIELD)
+            if self.delayed_output: # send decryption keys
+                with self.in_parallel():
+                    with self.if_conditionally(self.public_outputs > 0):
+                        with self.at_each_party(COMPUTE_PARTY, self.parties):
+                            self.broadcast(FIELD)
+                    with self.if_conditionally(self.private_outputs > 0):
+                        with self.at_each_party(COMPUTE_PARTY, self.parties):
+                            self.communicate(self.output_party, FIELD)
 
             # verify outputs
             with self.if_conditionally(self.is_non_linear):
@@ -825,28 +1286,30 @@ class OurProtocol(Protocol):
                     # verify second part of the offline phase
                     with self.for_each(self.private_outputs + self.public_outputs):
                         self.verify_authenticate()
-            with self.for_each(self.private_outputs):
-                self.finish_private_output()
-            with self.for_each(self.public_outputs):
-                self.finish_public_output()
+            with self.in_parallel():
+                with self.for_each(self.private_outputs):
+                    self.finish_private_output()
+                with self.for_each(self.public_outputs):
+                    self.finish_public_output()
             # finalize
-            with self.at_each_party(COMPUTE_PARTY, self.parties):
-                self.broadcast(BOOLEAN)
-            with self.at_each_party(INPUT_PARTY, self.input_parties):
-                self.broadcast(BOOLEAN)
-            with self.at_each_party(OUTPUT_PARTY, self.output_parties):
-                self.broadcast(BOOLEAN)
+            with self.in_parallel():
+                with self.at_each_party(COMPUTE_PARTY, self.parties):
+                    self.broadcast(BOOLEAN)
+                with self.at_each_party(self.input_party, self.input_parties):
+                    self.broadcast(BOOLEAN)
+                with self.at_each_party(self.output_party, self.output_parties):
+                    self.broadcast(BOOLEAN)
 
 Ours = OurProtocol
 
-BaumOrsiniScholl2016_batched_MAC_check = True
-BaumOrsiniScholl2016_distinct_setup_phase = True
 class BaumOrsiniScholl2016(Protocol):
     """
     Title: Efficient Secure Multiparty Computation with Identifiable Abort
     Authors: Carsten Baum, Emmanuela Orsini, Peter Scholl
     Paper: https://eprint.iacr.org/2016/187.pdf
     """
+    options = { "batched_MAC_check" : True, "distinct_setup_phase" : True }
+
 
     def RandShCtxt(self):
         """Fig. 10"""
@@ -888,7 +1351,7 @@ class BaumOrsiniScholl2016(Protocol):
             pass # TODO: KeyGen
 
         def SETUP():
-            if BaumOrsiniScholl2016_distinct_setup_phase:
+            if self.distinct_setup_phase:
                 return self.in_phase(SETUP_PHASE)
             else:
                 return self.in_phase(OFFLINE_PHASE)
@@ -965,7 +1428,7 @@ class BaumOrsiniScholl2016(Protocol):
         """Fig. 3"""
         assert self.party is None
         if check is None:
-            if BaumOrsiniScholl2016_batched_MAC_check:
+            if self.batched_MAC_check:
                 check = False
             else:
                 check = True
@@ -984,7 +1447,7 @@ class BaumOrsiniScholl2016(Protocol):
     def Output(self):
         """Fig. 6"""
         assert self.party is None
-        if BaumOrsiniScholl2016_batched_MAC_check:
+        if self.batched_MAC_check:
             with self.at_each_party(COMPUTE_PARTY, self.parties):
                 self.broadcast(FIELD)
                 self.compute(FIELD.sum(self.parties))
@@ -995,7 +1458,7 @@ class BaumOrsiniScholl2016(Protocol):
     def OutputCheck(self, count):
         """Fig. 6"""
         assert self.party is None
-        if BaumOrsiniScholl2016_batched_MAC_check:
+        if self.batched_MAC_check:
             self.rand(FIELD, count) # a_1, ...
             with self.at_each_party(COMPUTE_PARTY, self.parties):
                 with self.for_each(self.parties): # sum a_j sigma_j
@@ -1045,24 +1508,24 @@ class BaumOrsiniScholl2016(Protocol):
         with self.for_each(self.parties):
             self.compute(FIELD * FIELD) # operation on part of signature
 
-    def __init__(self, parties=COMPUTE_PARTY_COUNT, input_parties=INPUT_PARTY_COUNT, output_parties=OUTPUT_PARTY_COUNT, inputs=INPUT_COUNT, additions=ADDITION_COUNT, scalar_multiplications=SCALAR_MULTIPLICATION_COUNT, multiplications=MULTIPLICATION_COUNT, public_outputs=PUBLIC_OUTPUT_COUNT, private_outputs=PRIVATE_OUTPUT_COUNT):
-        super().__init__()
-        self.parties = sympy.simplify(parties)
-        self.input_parties = sympy.simplify(input_parties)
-        self.output_parties = sympy.simplify(output_parties)
-        self.inputs = sympy.simplify(inputs)
-        self.additions = sympy.simplify(additions)
-        self.scalar_multiplications = sympy.simplify(scalar_multiplications)
-        self.multiplications = sympy.simplify(multiplications)
-        self.public_outputs = sympy.simplify(public_outputs)
-        self.private_outputs = sympy.simplify(private_outputs)
+    def __init__(self, parties=COMPUTE_PARTY_COUNT, input_parties=INPUT_PARTY_COUNT, output_parties=OUTPUT_PARTY_COUNT, inputs=INPUT_COUNT, additions=ADDITION_COUNT, scalar_multiplications=SCALAR_MULTIPLICATION_COUNT, multiplications=MULTIPLICATION_COUNT, public_outputs=PUBLIC_OUTPUT_COUNT, private_outputs=PRIVATE_OUTPUT_COUNT, input_party=INPUT_PARTY, output_party=OUTPUT_PARTY, **options):
+        super().__init__(input_party, output_party, **options)
+        self.parties = workload(parties)
+        self.input_parties = workload(input_parties)
+        self.output_parties = workload(output_parties)
+        self.inputs = workload(inputs)
+        self.additions = workload(additions)
+        self.scalar_multiplications = workload(scalar_multiplications)
+        self.multiplications = workload(multiplications)
+        self.public_outputs = workload(public_outputs)
+        self.private_outputs = workload(private_outputs)
 
         # TODO: handle public verifiability
         # TODO: handle input parties that are not compute parties
 
         self.Setup()
 
-        with self.in_phase(OFFLINE_PHASE):
+        with combine(self.in_phase(OFFLINE_PHASE), self.in_parallel()):
             with self.for_each(self.inputs):
                 self.Input()
             with self.for_each(self.multiplications):
@@ -1083,7 +1546,7 @@ class BaumOrsiniScholl2016(Protocol):
                 with self.for_each(self.scalar_multiplications):
                     self.MulShare()
             # multiplications
-            with self.for_each(self.multiplications):
+            with combine(self.for_each(self.multiplications), self.in_sequence(MULTIPLICATION_DEPTH)):
                 with self.for_each(2): # a,b of the triple
                     with self.at_each_party(COMPUTE_PARTY, self.parties):
                         self.SubShare()
@@ -1101,13 +1564,14 @@ class BaumOrsiniScholl2016(Protocol):
         with self.in_phase(VERIFICATION_PHASE):
             self.OutputCheck(2 * self.multiplications + self.public_outputs + self.private_outputs)
 
-SpiniFehr2016_input_parties_known = True
 class SpiniFehr2016(SPDZLike):
     """
     Title: Cheater Detection in SPDZ Multiparty Computation
     Authors: Gabriele Spini, Serge Fehr
     Paper: https://ir.cwi.nl/pub/25035/25035.pdf
     """
+    options = { "input_parties_known" : True }
+
 
     def Open(self):
         """Sec. 2.3"""
@@ -1221,7 +1685,7 @@ class SpiniFehr2016(SPDZLike):
         """SPDZ, Fig. 7"""
         assert self.party is None
         self.RandShCtxt()
-        self.PBracket(not SpiniFehr2016_input_parties_known)
+        self.PBracket(not self.input_parties_known)
         self.PAngle()
 
     def Triple(self):
@@ -1259,17 +1723,17 @@ class SpiniFehr2016(SPDZLike):
             self.compute(CIPHERTEXT.sum(self.parties))
         # don't need PBracket on alpha as we use different MAC checking
 
-    def __init__(self, parties=COMPUTE_PARTY_COUNT, input_parties=INPUT_PARTY_COUNT, output_parties=OUTPUT_PARTY_COUNT, inputs=INPUT_COUNT, additions=ADDITION_COUNT, scalar_multiplications=SCALAR_MULTIPLICATION_COUNT, multiplications=MULTIPLICATION_COUNT, public_outputs=PUBLIC_OUTPUT_COUNT, private_outputs=PRIVATE_OUTPUT_COUNT):
-        super().__init__()
-        self.parties = sympy.simplify(parties)
-        self.input_parties = sympy.simplify(input_parties)
-        self.output_parties = sympy.simplify(output_parties)
-        self.inputs = sympy.simplify(inputs)
-        self.additions = sympy.simplify(additions)
-        self.scalar_multiplications = sympy.simplify(scalar_multiplications)
-        self.multiplications = sympy.simplify(multiplications)
-        self.public_outputs = sympy.simplify(public_outputs)
-        self.private_outputs = sympy.simplify(private_outputs)
+    def __init__(self, parties=COMPUTE_PARTY_COUNT, input_parties=INPUT_PARTY_COUNT, output_parties=OUTPUT_PARTY_COUNT, inputs=INPUT_COUNT, additions=ADDITION_COUNT, scalar_multiplications=SCALAR_MULTIPLICATION_COUNT, multiplications=MULTIPLICATION_COUNT, public_outputs=PUBLIC_OUTPUT_COUNT, private_outputs=PRIVATE_OUTPUT_COUNT, input_party=INPUT_PARTY, output_party=OUTPUT_PARTY, **options):
+        super().__init__(input_party, output_party, **options)
+        self.parties = workload(parties)
+        self.input_parties = workload(input_parties)
+        self.output_parties = workload(output_parties)
+        self.inputs = workload(inputs)
+        self.additions = workload(additions)
+        self.scalar_multiplications = workload(scalar_multiplications)
+        self.multiplications = workload(multiplications)
+        self.public_outputs = workload(public_outputs)
+        self.private_outputs = workload(private_outputs)
 
         # TODO: sacrificing
         block_size = 2 * self.multiplications / self.parties # two values per multiplication are opened in the online phase
@@ -1280,7 +1744,7 @@ class SpiniFehr2016(SPDZLike):
         with self.in_phase(SETUP_PHASE):
             self.Setup()
 
-        with self.in_phase(OFFLINE_PHASE):
+        with combine(self.in_phase(OFFLINE_PHASE), self.in_parallel()):
             with self.for_each(self.inputs + zero_tests):
                 self.Pair()
             with self.for_each(self.multiplications + zero_tests):
@@ -1298,7 +1762,7 @@ class SpiniFehr2016(SPDZLike):
                 with self.at_each_party(COMPUTE_PARTY, self.parties):
                     self.MulShare()
             # multiplications
-            with self.for_each(self.multiplications):
+            with combine(self.for_each(self.multiplications), self.in_sequence(MULTIPLICATION_DEPTH)):
                 with self.for_each(2): # a,b of the triple
                     with self.at_each_party(COMPUTE_PARTY, self.parties):
                         self.SubShare()
@@ -1309,24 +1773,26 @@ class SpiniFehr2016(SPDZLike):
                 with self.at_party(COMPUTE_PARTY):
                     self.compute(FIELD * FIELD)
                     self.AddCShare()
-            with self.for_each(block_count):
-                self.BlockCheck(block_size)
-            # outputs
-            with self.for_each(output_count):
-                self.Output()
+            with self.in_parallel():
+                with self.for_each(block_count):
+                    self.BlockCheck(block_size)
+                # outputs
+                with self.for_each(output_count):
+                    self.Output()
 
         with self.in_phase(VERIFICATION_PHASE):
             with self.for_each(output_count):
                 self.OutputCheck()
 
 
-CunninghamFullerYakoubov2016_batched_MAC_check = True
 class CunninghamFullerYakoubov2016(Protocol):
     """
     Title: Catching MPC Cheaters: Identification and Openability
     Authors: Robert Cunningham, Benjamin Fuller, Sophia Yakoubov
     Paper: https://eprint.iacr.org/2016/611.pdf
     """
+    options = { "batched_MAC_check" : True }
+
 
     # some subprotocols are equivalent to subprotocols in BaumOrsiniScholl2016
     RandShCtxt = BaumOrsiniScholl2016.RandShCtxt
@@ -1380,7 +1846,7 @@ class CunninghamFullerYakoubov2016(Protocol):
         with self.at_each_party(COMPUTE_PARTY, self.parties):
             self.broadcast(FIELD, 2)
             self.compute(FIELD.sum(self.parties))
-        if CunninghamFullerYakoubov2016_batched_MAC_check:
+        if self.batched_MAC_check:
             pass # do MAC check later
         else:
             self.MACCheck()
@@ -1492,8 +1958,8 @@ class CunninghamFullerYakoubov2016(Protocol):
     def PickSecretSharedBeaverTriple(self):
         """Fig. 14"""
         assert self.party is None
-        self.PickSecretSharedRandom()
-        self.PickSecretSharedRandom()
+        with self.for_each(2): # a, b
+            self.PickSecretSharedRandom()
         self.MultSecretSharedValues()
 
     def Setup(self):
@@ -1503,23 +1969,23 @@ class CunninghamFullerYakoubov2016(Protocol):
         self.DistMACKeyGen()
 
     def Check(self, count):
-        if CunninghamFullerYakoubov2016_batched_MAC_check:
+        if self.batched_MAC_check:
             # do an amortized SPDZ MAC check
             SPDZLike.Check(self, count)
         else:
             pass # already did MAC check in Open
 
-    def __init__(self, parties=COMPUTE_PARTY_COUNT, input_parties=INPUT_PARTY_COUNT, output_parties=OUTPUT_PARTY_COUNT, inputs=INPUT_COUNT, additions=ADDITION_COUNT, scalar_multiplications=SCALAR_MULTIPLICATION_COUNT, multiplications=MULTIPLICATION_COUNT, public_outputs=PUBLIC_OUTPUT_COUNT, private_outputs=PRIVATE_OUTPUT_COUNT):
-        super().__init__()
-        self.parties = sympy.simplify(parties)
-        self.input_parties = sympy.simplify(input_parties)
-        self.output_parties = sympy.simplify(output_parties)
-        self.inputs = sympy.simplify(inputs)
-        self.additions = sympy.simplify(additions)
-        self.scalar_multiplications = sympy.simplify(scalar_multiplications)
-        self.multiplications = sympy.simplify(multiplications)
-        self.public_outputs = sympy.simplify(public_outputs)
-        self.private_outputs = sympy.simplify(private_outputs)
+    def __init__(self, parties=COMPUTE_PARTY_COUNT, input_parties=INPUT_PARTY_COUNT, output_parties=OUTPUT_PARTY_COUNT, inputs=INPUT_COUNT, additions=ADDITION_COUNT, scalar_multiplications=SCALAR_MULTIPLICATION_COUNT, multiplications=MULTIPLICATION_COUNT, public_outputs=PUBLIC_OUTPUT_COUNT, private_outputs=PRIVATE_OUTPUT_COUNT, input_party=INPUT_PARTY, output_party=OUTPUT_PARTY, **options):
+        super().__init__(input_party, output_party, **options)
+        self.parties = workload(parties)
+        self.input_parties = workload(input_parties)
+        self.output_parties = workload(output_parties)
+        self.inputs = workload(inputs)
+        self.additions = workload(additions)
+        self.scalar_multiplications = workload(scalar_multiplications)
+        self.multiplications = workload(multiplications)
+        self.public_outputs = workload(public_outputs)
+        self.private_outputs = workload(private_outputs)
 
         # we ignore the "openable" protocol (Fig. 8) and just focus on identifiable abort
         # TODO: batched MAC check
@@ -1528,7 +1994,7 @@ class CunninghamFullerYakoubov2016(Protocol):
         with self.in_phase(SETUP_PHASE):
             self.Setup()
 
-        with self.in_phase(OFFLINE_PHASE):
+        with combine(self.in_phase(OFFLINE_PHASE), self.in_parallel()):
             with self.for_each(self.inputs):
                 self.PickSecretSharedRandom()
             with self.for_each(self.multiplications):
@@ -1544,7 +2010,7 @@ class CunninghamFullerYakoubov2016(Protocol):
             with self.for_each(self.scalar_multiplications):
                 self.MulShare()
             # multiplications
-            with self.for_each(self.multiplications):
+            with combine(self.for_each(self.multiplications), self.in_sequence(MULTIPLICATION_DEPTH)):
                 self.Multiply()
             # outputs
             with self.for_each(self.public_outputs + self.private_outputs): # TODO: handle private output
@@ -1577,7 +2043,7 @@ class KellerPastroRotaru2017(SPDZLike):
         """Fig. 4"""
         assert self.party is None
         m = count + 1
-        with self.at_party(COMPUTE_PARTY):
+        with combine(self.at_party(COMPUTE_PARTY), self.in_parallel()): # the shares and the MACs are sent at once
             with self.for_each(count):
                 with self.for_each(self.parties - 1):
                     self.compute(FIELD.sample())
@@ -1647,17 +2113,17 @@ class KellerPastroRotaru2017(SPDZLike):
                 self.compute(FIELD != FIELD)
         self.Check(2 * count)
 
-    def __init__(self, parties=COMPUTE_PARTY_COUNT, input_parties=INPUT_PARTY_COUNT, output_parties=OUTPUT_PARTY_COUNT, inputs=INPUT_COUNT, additions=ADDITION_COUNT, scalar_multiplications=SCALAR_MULTIPLICATION_COUNT, multiplications=MULTIPLICATION_COUNT, public_outputs=PUBLIC_OUTPUT_COUNT, private_outputs=PRIVATE_OUTPUT_COUNT):
-        super().__init__()
-        self.parties = sympy.simplify(parties)
-        self.input_parties = sympy.simplify(input_parties)
-        self.output_parties = sympy.simplify(output_parties)
-        self.inputs = sympy.simplify(inputs)
-        self.additions = sympy.simplify(additions)
-        self.scalar_multiplications = sympy.simplify(scalar_multiplications)
-        self.multiplications = sympy.simplify(multiplications)
-        self.public_outputs = sympy.simplify(public_outputs)
-        self.private_outputs = sympy.simplify(private_outputs)
+    def __init__(self, parties=COMPUTE_PARTY_COUNT, input_parties=INPUT_PARTY_COUNT, output_parties=OUTPUT_PARTY_COUNT, inputs=INPUT_COUNT, additions=ADDITION_COUNT, scalar_multiplications=SCALAR_MULTIPLICATION_COUNT, multiplications=MULTIPLICATION_COUNT, public_outputs=PUBLIC_OUTPUT_COUNT, private_outputs=PRIVATE_OUTPUT_COUNT, input_party=INPUT_PARTY, output_party=OUTPUT_PARTY, **options):
+        super().__init__(input_party, output_party, **options)
+        self.parties = workload(parties)
+        self.input_parties = workload(input_parties)
+        self.output_parties = workload(output_parties)
+        self.inputs = workload(inputs)
+        self.additions = workload(additions)
+        self.scalar_multiplications = workload(scalar_multiplications)
+        self.multiplications = workload(multiplications)
+        self.public_outputs = workload(public_outputs)
+        self.private_outputs = workload(private_outputs)
 
         # TODO: handle inputs not in the online phase
         # TODO: handle input parties that are not compute parties
@@ -1680,7 +2146,7 @@ class KellerPastroRotaru2017(SPDZLike):
                 with self.for_each(self.scalar_multiplications):
                     self.MulShare()
             # multiplications
-            with self.for_each(self.multiplications):
+            with combine(self.for_each(self.multiplications), self.in_sequence(MULTIPLICATION_DEPTH)):
                 with self.for_each(2): # a,b of the triple
                     with self.at_each_party(COMPUTE_PARTY, self.parties):
                         self.SubShare()
@@ -1709,12 +2175,13 @@ class BaumCozzoSmart2019(SPDZLike):
 
     def zk(self):
         assert self.party is None
-        # Samp
-        with self.at_each_party(COMPUTE_PARTY, self.parties):
-            self.compute(FIELD.sample())
-            self.encrypt()
-            self.commit()
-            self.decommit()
+        with combine(self.at_each_party(COMPUTE_PARTY, self.parties), self.in_parallel()): # the commitment of Comm does not depend on Samp
+            # Samp
+            with self.in_branch():
+                self.compute(FIELD.sample())
+                self.encrypt()
+                self.commit()
+                self.decommit()
             # Comm
             self.compute(CIPHERTEXT_FIELD.sample()) # not uniformly random
             self.encrypt()
@@ -1774,17 +2241,17 @@ class BaumCozzoSmart2019(SPDZLike):
                 self.decrypt_distributed_shares()
             self.compute(FIELD + FIELD, 2) # shares of a and b have to be doubled
 
-    def __init__(self, parties=COMPUTE_PARTY_COUNT, input_parties=INPUT_PARTY_COUNT, output_parties=OUTPUT_PARTY_COUNT, inputs=INPUT_COUNT, additions=ADDITION_COUNT, scalar_multiplications=SCALAR_MULTIPLICATION_COUNT, multiplications=MULTIPLICATION_COUNT, public_outputs=PUBLIC_OUTPUT_COUNT, private_outputs=PRIVATE_OUTPUT_COUNT):
-        super().__init__()
-        self.parties = sympy.simplify(parties)
-        self.input_parties = sympy.simplify(input_parties)
-        self.output_parties = sympy.simplify(output_parties)
-        self.inputs = sympy.simplify(inputs)
-        self.additions = sympy.simplify(additions)
-        self.scalar_multiplications = sympy.simplify(scalar_multiplications)
-        self.multiplications = sympy.simplify(multiplications)
-        self.public_outputs = sympy.simplify(public_outputs)
-        self.private_outputs = sympy.simplify(private_outputs)
+    def __init__(self, parties=COMPUTE_PARTY_COUNT, input_parties=INPUT_PARTY_COUNT, output_parties=OUTPUT_PARTY_COUNT, inputs=INPUT_COUNT, additions=ADDITION_COUNT, scalar_multiplications=SCALAR_MULTIPLICATION_COUNT, multiplications=MULTIPLICATION_COUNT, public_outputs=PUBLIC_OUTPUT_COUNT, private_outputs=PRIVATE_OUTPUT_COUNT, input_party=INPUT_PARTY, output_party=OUTPUT_PARTY, **options):
+        super().__init__(input_party, output_party, **options)
+        self.parties = workload(parties)
+        self.input_parties = workload(input_parties)
+        self.output_parties = workload(output_parties)
+        self.inputs = workload(inputs)
+        self.additions = workload(additions)
+        self.scalar_multiplications = workload(scalar_multiplications)
+        self.multiplications = workload(multiplications)
+        self.public_outputs = workload(public_outputs)
+        self.private_outputs = workload(private_outputs)
 
         # TODO: sacrificing is not mentioned for TopGear
         # TODO: handle input parties that are not compute parties
@@ -1792,7 +2259,7 @@ class BaumCozzoSmart2019(SPDZLike):
         with self.in_phase(SETUP_PHASE):
             self.Init()
 
-        with self.in_phase(OFFLINE_PHASE):
+        with combine(self.in_phase(OFFLINE_PHASE), self.in_parallel()):
             with self.for_each(self.multiplications):
                 self.Triples()
             with self.for_each(self.inputs):
@@ -1812,7 +2279,7 @@ class BaumCozzoSmart2019(SPDZLike):
                 with self.for_each(self.scalar_multiplications):
                     self.MulShare()
             # multiplications
-            with self.for_each(self.multiplications):
+            with combine(self.for_each(self.multiplications), self.in_sequence(MULTIPLICATION_DEPTH)):
                 with self.for_each(2): # a,b of the triple
                     with self.at_each_party(COMPUTE_PARTY, self.parties):
                         self.SubShare()
@@ -1994,7 +2461,7 @@ class CohenDoernerKondiShelat2023(Protocol):
         with self.for_each(self.scalar_multiplications):
             mul_constant()
         # multiplications
-        with self.for_each(self.multiplications):
+        with combine(self.for_each(self.multiplications), self.in_sequence(MULTIPLICATION_DEPTH)):
             with self.for_each(2): # for a, b of the triple
                 add() # mask each component of the authenticated share
                 open()
@@ -2005,17 +2472,17 @@ class CohenDoernerKondiShelat2023(Protocol):
         # TODO: outputs
 
 
-    def __init__(self, parties=COMPUTE_PARTY_COUNT, input_parties=INPUT_PARTY_COUNT, output_parties=OUTPUT_PARTY_COUNT, inputs=INPUT_COUNT, additions=ADDITION_COUNT, scalar_multiplications=SCALAR_MULTIPLICATION_COUNT, multiplications=MULTIPLICATION_COUNT, public_outputs=PUBLIC_OUTPUT_COUNT, private_outputs=PRIVATE_OUTPUT_COUNT):
-        super().__init__()
-        self.parties = sympy.simplify(parties)
-        self.input_parties = sympy.simplify(input_parties)
-        self.output_parties = sympy.simplify(output_parties)
-        self.inputs = sympy.simplify(inputs)
-        self.additions = sympy.simplify(additions)
-        self.scalar_multiplications = sympy.simplify(scalar_multiplications)
-        self.multiplications = sympy.simplify(multiplications)
-        self.public_outputs = sympy.simplify(public_outputs)
-        self.private_outputs = sympy.simplify(private_outputs)
+    def __init__(self, parties=COMPUTE_PARTY_COUNT, input_parties=INPUT_PARTY_COUNT, output_parties=OUTPUT_PARTY_COUNT, inputs=INPUT_COUNT, additions=ADDITION_COUNT, scalar_multiplications=SCALAR_MULTIPLICATION_COUNT, multiplications=MULTIPLICATION_COUNT, public_outputs=PUBLIC_OUTPUT_COUNT, private_outputs=PRIVATE_OUTPUT_COUNT, input_party=INPUT_PARTY, output_party=OUTPUT_PARTY, **options):
+        super().__init__(input_party, output_party, **options)
+        self.parties = workload(parties)
+        self.input_parties = workload(input_parties)
+        self.output_parties = workload(output_parties)
+        self.inputs = workload(inputs)
+        self.additions = workload(additions)
+        self.scalar_multiplications = workload(scalar_multiplications)
+        self.multiplications = workload(multiplications)
+        self.public_outputs = workload(public_outputs)
+        self.private_outputs = workload(private_outputs)
 
         # TODO: handle public verifiability
         # TODO: handle inputs
@@ -2102,7 +2569,7 @@ class BaumMelissarisRachuriScholl2023(Protocol):
         # seed==None indicates receiving party
         with self.at_party(COMPUTE_PARTY): # sender and receiver; just approximate values
             if count != 0: # avoid log(0)
-                self.communicate(COMPUTE_PARTY, FIELD, sympy.log(count))
+                self.communicate(COMPUTE_PARTY, FIELD, math.log(count) if Protocol_numeric else sympy.log(count))
                 self.compute(FIELD + FIELD, count)
                 self.compute(FIELD * FIELD, count)
 
@@ -2111,14 +2578,14 @@ class BaumMelissarisRachuriScholl2023(Protocol):
         assert self.party is None
         with self.at_party(COMPUTE_PARTY):
             self.compute(FIELD.sample())
-        with self.for_each(self.parties - 1):
+        with combine(self.for_each(self.parties - 1), self.in_parallel()):
             self.VOLEExtend(count, True) # sender
             self.VOLEExtend(count, None) # receiver
         self.rand(FIELD, count)
         with self.for_each(count):
             self.MulAngle() # xi_i * l_i
             self.AddAngle() # sum x_i * l_i + l_m+1
-        with self.at_party(COMPUTE_PARTY):
+        with combine(self.at_party(COMPUTE_PARTY), self.in_parallel()):
             self.broadcast(FIELD)
             with self.for_each(self.parties - 1):
                 self.communicate(COMPUTE_PARTY, FIELD, 1)
@@ -2168,8 +2635,9 @@ class BaumMelissarisRachuriScholl2023(Protocol):
             self.MulShare() # t_i * a
             self.AddShare() # t_i * a + a'
             self.AddShare() # b + b'
-            self.Open() # alpha
-            self.Open() # beta
+            with self.in_parallel():
+                self.Open() # alpha
+                self.Open() # beta
             self.MulShare() # t_i * c
             self.SubShare() # - c'
             self.AddShare() # +
@@ -2193,17 +2661,17 @@ class BaumMelissarisRachuriScholl2023(Protocol):
             self.broadcast(FIELD)
         self.AddCShare()
 
-    def __init__(self, parties=COMPUTE_PARTY_COUNT, input_parties=INPUT_PARTY_COUNT, output_parties=OUTPUT_PARTY_COUNT, inputs=INPUT_COUNT, additions=ADDITION_COUNT, scalar_multiplications=SCALAR_MULTIPLICATION_COUNT, multiplications=MULTIPLICATION_COUNT, public_outputs=PUBLIC_OUTPUT_COUNT, private_outputs=PRIVATE_OUTPUT_COUNT):
-        super().__init__()
-        self.parties = sympy.simplify(parties)
-        self.input_parties = sympy.simplify(input_parties)
-        self.output_parties = sympy.simplify(output_parties)
-        self.inputs = sympy.simplify(inputs)
-        self.additions = sympy.simplify(additions)
-        self.scalar_multiplications = sympy.simplify(scalar_multiplications)
-        self.multiplications = sympy.simplify(multiplications)
-        self.public_outputs = sympy.simplify(public_outputs)
-        self.private_outputs = sympy.simplify(private_outputs)
+    def __init__(self, parties=COMPUTE_PARTY_COUNT, input_parties=INPUT_PARTY_COUNT, output_parties=OUTPUT_PARTY_COUNT, inputs=INPUT_COUNT, additions=ADDITION_COUNT, scalar_multiplications=SCALAR_MULTIPLICATION_COUNT, multiplications=MULTIPLICATION_COUNT, public_outputs=PUBLIC_OUTPUT_COUNT, private_outputs=PRIVATE_OUTPUT_COUNT, input_party=INPUT_PARTY, output_party=OUTPUT_PARTY, **options):
+        super().__init__(input_party, output_party, **options)
+        self.parties = workload(parties)
+        self.input_parties = workload(input_parties)
+        self.output_parties = workload(output_parties)
+        self.inputs = workload(inputs)
+        self.additions = workload(additions)
+        self.scalar_multiplications = workload(scalar_multiplications)
+        self.multiplications = workload(multiplications)
+        self.public_outputs = workload(public_outputs)
+        self.private_outputs = workload(private_outputs)
 
         # TODO: Generate correlated randomness
 
@@ -2214,9 +2682,11 @@ class BaumMelissarisRachuriScholl2023(Protocol):
                     self.compute(FIELD.sample())
                     self.communicate(COMPUTE_PARTY, FIELD)
 
-        with self.in_phase(OFFLINE_PHASE):
-            self.TripleGeneration(self.multiplications)
-            self.RandInput(self.inputs)
+        with combine(self.in_phase(OFFLINE_PHASE), self.in_parallel()):
+            with self.in_branch():
+                self.TripleGeneration(self.multiplications)
+            with self.in_branch():
+                self.RandInput(self.inputs)
 
         with self.in_phase(ONLINE_PHASE):
             # inputs
@@ -2228,7 +2698,7 @@ class BaumMelissarisRachuriScholl2023(Protocol):
             with self.for_each(self.scalar_multiplications):
                 self.MulShare()
             # multiplications
-            with self.for_each(self.multiplications):
+            with combine(self.for_each(self.multiplications), self.in_sequence(MULTIPLICATION_DEPTH)):
                 with self.for_each(2): # a,b of the triple
                     self.SubShare()
                     self.Open()
@@ -2237,24 +2707,178 @@ class BaumMelissarisRachuriScholl2023(Protocol):
                 with self.at_each_party(COMPUTE_PARTY, self.parties):
                     self.compute(FIELD * FIELD)
                 self.AddCShare()
-            with self.for_each(self.public_outputs):
-                self.Output()
-            with self.for_each(self.private_outputs):
-                self.HComPrivOpen(1)
+            with self.in_parallel():
+                with self.for_each(self.public_outputs):
+                    self.Output()
+                with self.for_each(self.private_outputs):
+                    self.HComPrivOpen(1)
+
+
+class ModelCache:
+    """
+    Content-addressed disk cache of constructed protocol models.
+
+    Models are keyed by the source code of everything their class depends on (classes, functions, constants, and switches referenced from it)
+    and the constructor arguments (including the input and output party and the scenario options).
+    Models keep the sums and polynomials computed for rendering, so `update` stores them again after rendering.
+    """
+    def __init__(self, directory=None):
+        if directory is None:
+            directory = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "pia-mpc", "complexity")
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        # pickled models refer to their classes by module, which is "__main__" when run as script
+        self.versions = f"python-{platform.python_version()}-sympy-{sympy.__version__}-{__name__}"
+        self.stored = {}
+
+    @staticmethod
+    @cache
+    def definitions():
+        """Source code of the classes and functions defined in this module"""
+        with open(__file__) as f:
+            source = f.read()
+        lines = source.splitlines()
+        # slicing the lines once instead of `ast.get_source_segment`, which splits the whole source again for each node
+        return { node.name : "\n".join(lines[node.lineno - 1:node.end_lineno]) for node in ast.parse(source).body if isinstance(node, (ast.ClassDef, ast.FunctionDef)) }
+
+    @staticmethod
+    @cache
+    def references(name):
+        """Identifiers in the source code of `name`"""
+        return set(re.findall(r"\b[A-Za-z_]\w*\b", ModelCache.definitions()[name]))
+
+    @staticmethod
+    @cache
+    def dependencies(name):
+        """Hash of the source code and values that the model of `name` depends on"""
+        definitions = ModelCache.definitions()
+        pending = [name]
+        seen = set()
+        sources = set()
+        while pending:
+            name = pending.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            if name in definitions:
+                sources.add(definitions[name])
+                pending.extend(ModelCache.references(name))
+                continue
+            value = globals().get(name)
+            if isinstance(value, Arithmetic):
+                pending.append(type(value).__name__)
+            elif isinstance(value, (bool, int, str, sympy.Basic)):
+                sources.add(f"{name} = {sympy.srepr(value)}")
+        return hashlib.sha256("\n".join(sorted(sources)).encode()).hexdigest()
+
+    def file(self, protocol, kwargs):
+        key = repr((self.versions, self.dependencies(protocol), protocol, sorted((k, sympy.srepr(v)) for k, v in kwargs.items())))
+        return os.path.join(self.directory, f"{hashlib.sha256(key.encode()).hexdigest()}.pickle")
+
+    def load(self, file):
+        try:
+            with open(file, "rb") as f:
+                data = f.read()
+            result = pickle.loads(data)
+            self.hits += 1
+            self.stored[file] = (result, len(data))
+            return result
+        except (FileNotFoundError, EOFError, AttributeError, pickle.UnpicklingError):
+            self.misses += 1
+            return None
+
+    def store(self, file, model):
+        data = pickle.dumps(model)
+        os.makedirs(self.directory, exist_ok=True)
+        with open(f"{file}.{os.getpid()}", "wb") as f:
+            f.write(data)
+        os.replace(f"{file}.{os.getpid()}", file)
+        self.stored[file] = (model, len(data))
+
+    def update(self):
+        """Store the models again that gained sums or polynomials since they were loaded or stored"""
+        for file, (model, size) in list(self.stored.items()):
+            if len(pickle.dumps(model)) != size:
+                self.store(file, model)
+
+    def __str__(self):
+        return f"{self.hits} hits, {self.misses} misses"
+
+def model(protocol, kwargs):
+    """Construct a single protocol model (in a worker process of `construct`)"""
+    return globals()[protocol](**kwargs)
+
+def construct(tasks, jobs=None, cache=None):
+    """
+    Construct the models of (protocol, constructor arguments) pairs.
+
+    :param jobs: Number of worker processes; defaults to one per model (up to the number of CPUs).
+    :param cache: A `ModelCache` to load models from and store them to (or `None` for no caching).
+    """
+    if cache is not None:
+        files = [cache.file(protocol, kwargs) for protocol, kwargs in tasks]
+        results = [cache.load(file) for file in files]
+        missing = [i for i, result in enumerate(results) if result is None]
+        for i, result in zip(missing, construct([tasks[i] for i in missing], jobs=jobs)):
+            cache.store(files[i], result)
+            results[i] = result
+        return results
+
+    if jobs is None:
+        jobs = min(len(tasks), os.cpu_count() or 1)
+    if jobs <= 1:
+        return [model(protocol, kwargs) for protocol, kwargs in tasks]
+
+    # models are sent back pickled; `map` keeps the order of the tasks
+    with ProcessPoolExecutor(jobs) as executor:
+        return list(executor.map(model, *zip(*tasks)))
+
+def scenario_options(protocol=None):
+    """Names of the scenario options of `protocol` (or of any protocol)"""
+    if protocol is not None:
+        return set(globals()[protocol].options)
+    return { name for value in globals().values() if isinstance(value, type) and issubclass(value, Protocol) for name in value.options }
+
+def models(*protocols, jobs=None, cache=None, **kwargs):
+    """
+    Construct the models of the given protocols.
 
+    :param kwargs: Constructor arguments, i.e., the workload, the input and output party, and scenario options (each protocol only gets the options it has).
+    :param jobs: See `construct`.
+    :param cache: See `construct`.
+    """
+    others = scenario_options()
+    tasks = [(protocol, { k : v for k, v in kwargs.items() if k not in others or k in scenario_options(protocol) }) for protocol in protocols]
+    return construct(tasks, jobs=jobs, cache=cache)
 
-def table(*protocols, communication=False, computation=False, phases=[SETUP_PHASE, OFFLINE_PHASE, ONLINE_PHASE, VERIFICATION_PHASE], parties=[COMPUTE_PARTY, INPUT_PARTY, OUTPUT_PARTY], collapse=False, midrules=False, O_notation=False, zero=None, input_party=INPUT_PARTY, output_party=OUTPUT_PARTY, **kwargs):
-    assert communication or computation
+def table(*protocols, communication=False, computation=False, phases=[SETUP_PHASE, OFFLINE_PHASE, ONLINE_PHASE, VERIFICATION_PHASE], parties=[COMPUTE_PARTY, INPUT_PARTY, OUTPUT_PARTY], collapse=False, midrules=False, O_notation=False, zero=None, rounds=False, input_party=INPUT_PARTY, output_party=OUTPUT_PARTY, statistics=False, cache=True, **kwargs):
+    """
+    :param rounds: Also print the communication rounds of each phase (with `D` the multiplicative depth of the circuit).
+    :param cache: Cache models on disk (in the given directory or, if `True`, in "$XDG_CACHE_HOME/pia-mpc/complexity").
+    """
+    assert communication or computation or rounds
     print("% generated by:")
     print("% python", shlex.join(sys.argv))
 
-    global INPUT_PARTY
-    if input_party != INPUT_PARTY:
-        INPUT_PARTY = input_party
+    if cache:
+        cache = ModelCache(None if cache is True else cache)
+    else:
+        cache = None
+
+    protocols = models(*protocols, input_party=input_party, output_party=output_party, cache=cache, **kwargs)
 
-    global OUTPUT_PARTY
-    if output_party != OUTPUT_PARTY:
-        OUTPUT_PARTY = output_party
+    render(protocols, communication=communication, computation=computation, phases=phases, parties=parties, collapse=collapse, midrules=midrules, O_notation=O_notation, zero=zero, rounds=rounds)
+
+    if cache is not None:
+        cache.update()
+        print(f"% model cache: {cache}", file=sys.stderr)
+    if statistics:
+        print(f"% simplification cache: {simplify}", file=sys.stderr)
+
+def render(protocols, communication=False, computation=False, phases=[SETUP_PHASE, OFFLINE_PHASE, ONLINE_PHASE, VERIFICATION_PHASE], parties=[COMPUTE_PARTY, INPUT_PARTY, OUTPUT_PARTY], collapse=False, midrules=False, O_notation=False, zero=None, rounds=False):
+    """Print the LaTeX table of the given protocol models (see `table`)"""
+    assert communication or computation or rounds
 
     if collapse is False:
         collapse = 0
@@ -2264,41 +2888,9 @@ def table(*protocols, communication=False, computation=False, phases=[SETUP_PHAS
     if isinstance(O_notation, str):
         O_notation = O_notation.upper().replace("-", "_")
 
-    protocols = [globals()[protocol](**kwargs) for protocol in protocols]
-
     senders = parties
     receivers = parties + [BULLETIN_BOARD]
 
-    def strip_constants(value):
-        orig_vars = [COMPUTE_PARTY_COUNT, INPUT_PARTY_COUNT, OUTPUT_PARTY_COUNT, INPUT_COUNT, ADDITION_COUNT, SCALAR_MULTIPLICATION_COUNT, MULTIPLICATION_COUNT, PUBLIC_OUTPUT_COUNT, PRIVATE_OUTPUT_COUNT]
-        log_vars = [sympy.log(x) for x in orig_vars]
-        vars = orig_vars + log_vars
-        p = sympy.Poly(value, *vars)
-        result = 0
-
-        def orig_exponents(exponents):
-            return exponents[:len(orig_vars)]
-        def log_exponents(exponents):
-            return exponents[len(orig_vars):]
-        def combined_exponents(exponents):
-            return [(x, y) for x, y in zip(orig_exponents(exponents), log_exponents(exponents))]
-
-        combined_vars = combined_exponents(vars)
-
-        all_exponents = list(sorted(map(combined_exponents, p.as_dict().keys())))
-
-        for i, exponents in enumerate(all_exponents):
-            if any(all(y >= x for x, y in zip(exponents, other)) for other in all_exponents[i+1:]):
-                continue
-
-            y = 1
-            for (var, log_var), (exponent, log_exponent) in zip(combined_vars, exponents):
-                y *= var ** exponent
-                y *= log_var ** log_exponent
-            result += y
-        return result
-
-
     def latex(*args, **kwargs):
         print(*args, **kwargs, sep = " & ", end="")
     def endl(*args, **kwargs):
@@ -2310,29 +2902,9 @@ def table(*protocols, communication=False, computation=False, phases=[SETUP_PHAS
             latex(prefix + str(zero))
     def format(value, var=COMPUTE_PARTY_COUNT):
         if O_notation == "KEEP_FACTORS":
-            COMMUNICATION = [BOOLEAN_ELEMENT, FIELD_ELEMENT, CIPHERTEXT_FIELD_ELEMENT, CIPHERTEXT_ELEMENT, COMMITMENT_ELEMENT, DECOMMITMENT, DISTRIBUTED_DECRYPTION, ZK, PUBLIC_KEY_ZK, COMMITMENT_ZK]
-            COMMUNICATION += [sympy.Symbol(f"public_random_{x}") for x in COMMUNICATION]
-            COMPUTATION = []
-            value = sympy.simplify(value)
-            value = value.subs([(x, 1) for x in COMMUNICATION + COMPUTATION])
-            value = strip_constants(value)
-            # p = sympy.Poly(value, var)
-            # assert all(len(exponent) == 1 for exponent in p.as_dict().keys())
-            # max_exponent = 0
-            # max_factor = 0
-            # for (exponent,), factor in p.as_dict().items():
-            #     if exponent > max_exponent:
-            #         max_factor = factor
-            #         max_exponent = exponent
-            # if max_exponent > 0:
-            #     value = max_factor * var ** max_exponent
-            # else:
-            #     value = 0
+            value = value.dominant()
         elif O_notation:
-            p = sympy.Poly(value, var)
-            exponents = p.as_dict().keys()
-            assert all(len(exponent) == 1 for exponent in exponents)
-            exponent = max([exponent[0] for exponent in exponents] + [0])
+            exponent = value.degree(var)
             if exponent > 0:
                 value = var ** exponent
             else:
@@ -2361,20 +2933,24 @@ def table(*protocols, communication=False, computation=False, phases=[SETUP_PHAS
         print(r"\bottomrule")
         print(r"\end{tabular}")
 
+    # matrices indexed by protocol, phase, sender (and receiver) restricted to the requested parties
+    senders_index = [PARTIES.index(party) for party in senders]
+    receivers_index = [RECEIVERS.index(party) for party in receivers]
+    if communication:
+        matrix = numpy.stack([protocol.communication_matrix(phases, polynomials=bool(O_notation)) for protocol in protocols])[:, :, senders_index][:, :, :, receivers_index]
+    if computation:
+        vector = numpy.stack([protocol.computation_matrix(phases, polynomials=bool(O_notation)) for protocol in protocols])[:, :, senders_index]
+
     if communication and collapse == 0:
         columns = 2 + len(protocols)
         header(columns, "sender", "receiver", *[protocol.__class__.__name__ for protocol in protocols])
         for row, phase in enumerate(phases):
             phase_header(columns, len(senders)*len(receivers), phase, row=row)
-            for sender in senders:
-                for receiver in receivers:
+            for i, sender in enumerate(senders):
+                for j, receiver in enumerate(receivers):
                     latex("& ")
                     latex(sender, receiver)
-                    for protocol in protocols:
-                        try:
-                            x = protocol.phases[phase].communication.communication[(sender, receiver)]
-                        except KeyError:
-                            x = 0
+                    for x in matrix[:, row, i, j]:
                         latex(" & ")
                         format(x)
                     endl()
@@ -2382,31 +2958,19 @@ def table(*protocols, communication=False, computation=False, phases=[SETUP_PHAS
     elif communication and collapse == 1:
         columns = 2 + len(protocols)
         header(columns, "sender", "receiver", *[protocol.__class__.__name__ for protocol in protocols])
+        any_party = matrix[:, :, :, :-1].sum(axis=3)
         for row, phase in enumerate(phases):
             phase_header(columns, 2, phase, row=row)
-            for sender in senders:
-                receiver = ANY_PARTY
+            for i, sender in enumerate(senders):
                 latex("& ")
-                latex(sender, receiver)
-                for protocol in protocols:
-                    x = 0
-                    for receiver in senders:
-                        try:
-                            y = protocol.phases[phase].communication.communication[(sender, receiver)]
-                            x += y
-                        except KeyError:
-                            pass
+                latex(sender, ANY_PARTY)
+                for x in any_party[:, row, i]:
                     latex(" & ")
                     format(x)
                 endl()
-                receiver = BULLETIN_BOARD
                 latex("& ")
-                latex(sender, receiver)
-                for protocol in protocols:
-                    try:
-                        x = protocol.phases[phase].communication.communication[(sender, receiver)]
-                    except KeyError:
-                        x = 0
+                latex(sender, BULLETIN_BOARD)
+                for x in matrix[:, row, i, -1]:
                     latex(" & ")
                     format(x)
                 endl()
@@ -2414,19 +2978,13 @@ def table(*protocols, communication=False, computation=False, phases=[SETUP_PHAS
     elif communication and collapse == 2:
         columns = 1 + len(protocols)
         header(columns, "sender", *[protocol.__class__.__name__ for protocol in protocols])
+        any_receiver = matrix.sum(axis=3)
         for row, phase in enumerate(phases):
             phase_header(columns, len(senders), phase, row=row)
-            for sender in senders:
+            for i, sender in enumerate(senders):
                 latex("& ")
                 latex(sender)
-                for protocol in protocols:
-                    x = 0
-                    for receiver in receivers:
-                        try:
-                            y = protocol.phases[phase].communication.communication[(sender, receiver)]
-                            x += y
-                        except KeyError:
-                            pass
+                for x in any_receiver[:, row, i]:
                     latex(" & ")
                     format(x)
                 endl()
@@ -2434,40 +2992,36 @@ def table(*protocols, communication=False, computation=False, phases=[SETUP_PHAS
     elif communication and collapse == 3:
         columns = 1 + len(protocols)
         header(columns, "receiver", *[protocol.__class__.__name__ for protocol in protocols])
+        any_party = matrix[:, :, :, :-1].sum(axis=(2, 3))
+        bulletin_board = matrix[:, :, :, -1].sum(axis=2)
         for row, phase in enumerate(phases):
             phase_header(columns, 2, phase, row=row)
-            receiver = ANY_PARTY
             latex("& ")
-            latex(receiver)
-            for protocol in protocols:
-                x = 0
-                for sender in senders:
-                    for receiver in senders:
-                        try:
-                            y = protocol.phases[phase].communication.communication[(sender, receiver)]
-                            x += y
-                        except KeyError:
-                            pass
+            latex(ANY_PARTY)
+            for x in any_party[:, row]:
                 latex(" & ")
                 format(x)
             endl()
-            receiver = BULLETIN_BOARD
             latex("& ")
-            latex(receiver)
-            for protocol in protocols:
-                x = 0
-                for sender in senders:
-                    try:
-                        y = protocol.phases[phase].communication.communication[(sender, receiver)]
-                        x += y
-                    except KeyError:
-                        pass
+            latex(BULLETIN_BOARD)
+            for x in bulletin_board[:, row]:
                 latex(" & ")
                 format(x)
             endl()
         footer()
     elif communication and collapse == 4:
-        pass # TODO
+        columns = len(protocols)
+        header(columns, *[protocol.__class__.__name__ for protocol in protocols])
+        total = matrix.sum(axis=(2, 3))
+        for row, phase in enumerate(phases):
+            phase_header(columns, 1, phase, row=row)
+            latex("& ")
+            for protocol_id, x in enumerate(total[:, row]):
+                if protocol_id != 0:
+                    latex(" & ")
+                format(x)
+            endl()
+        footer()
     elif communication:
         raise ValueError("--collapse should be 0 (all information), 1 (receiver collapsed to Some/All), 2 (receiver collapsed to Any), 3 (sender collapsed, receiver collapsed to Some/All), or 4 (sender collapsed, receiver collapsed to Any)")
 
@@ -2479,14 +3033,10 @@ def table(*protocols, communication=False, computation=False, phases=[SETUP_PHAS
         header(columns, "party", *[protocol.__class__.__name__ for protocol in protocols])
         for row, phase in enumerate(phases):
             phase_header(columns, len(parties), phase, row=row)
-            for party in parties:
+            for i, party in enumerate(parties):
                 latex("& ")
                 latex(party)
-                for protocol in protocols:
-                    try:
-                        x = protocol.phases[phase].computation.computation[party]
-                    except KeyError:
-                        x = 0
+                for x in vector[:, row, i]:
                     latex(" & ")
                     format(x)
                 endl()
@@ -2494,17 +3044,11 @@ def table(*protocols, communication=False, computation=False, phases=[SETUP_PHAS
     elif computation and collapse == 1:
         columns = len(protocols)
         header(columns, *[protocol.__class__.__name__ for protocol in protocols])
+        total = vector.sum(axis=2)
         for row, phase in enumerate(phases):
             phase_header(columns, 1, phase, row=row)
             latex("& ")
-            for protocol_id, protocol in enumerate(protocols):
-                x = 0
-                for party in parties:
-                    try:
-                        y = protocol.phases[phase].computation.computation[party]
-                        x += y
-                    except KeyError:
-                        pass
+            for protocol_id, x in enumerate(total[:, row]):
                 if protocol_id != 0:
                     latex(" & ")
                 format(x)
@@ -2513,6 +3057,872 @@ def table(*protocols, communication=False, computation=False, phases=[SETUP_PHAS
     elif computation:
         raise ValueError("--collapse should be 0 (all information), or 1 (compute party collapsed)")
 
+    if rounds and (communication or computation):
+        print()
+
+    if rounds:
+        columns = len(protocols)
+        header(columns, *[protocol.__class__.__name__ for protocol in protocols])
+        for row, phase in enumerate(phases):
+            phase_header(columns, 1, phase, row=row)
+            latex("& ")
+            for protocol_id, protocol in enumerate(protocols):
+                if protocol_id != 0:
+                    latex(" & ")
+                value = protocol.rounds(phase)
+                if value == 0:
+                    latex_zero()
+                else:
+                    latex(f"${sympy.latex(value)}$")
+            endl()
+        footer()
+
+def tables(manifest, directory=".", jobs=None, statistics=False, cache=True):
+    """
+    Generate several tables at once, constructing each protocol model only once.
+
+    The manifest is a JSON list of tables, each with
+    - "output": the output file (relative to `directory`),
+    - "script": "complexity.py" (default) for a `table` of this script or "bgv-parameters.py" for the `table` of "bgv-parameters.py",
+    - "protocols": the protocols of the table (for "complexity.py"),
+    - "options": the (keyword) arguments of `table`, e.g., {"communication": true, "collapse": 3, "inputs": 1}.
+
+    :param directory: Directory for the output files.
+    :param cache: See `table`.
+    """
+    with open(manifest) as f:
+        manifest = json.load(f)
+
+    if cache:
+        cache = ModelCache(None if cache is True else cache)
+    else:
+        cache = None
+
+    # group the protocols by the arguments to their constructors, so each model is constructed once
+    rendering = inspect.signature(render).parameters
+    groups = {}
+    for entry in manifest:
+        if entry.get("script", "complexity.py") != "complexity.py":
+            continue
+        options = { k.replace("-", "_") : v for k, v in entry.get("options", {}).items() }
+        kwargs = { k : v for k, v in options.items() if k not in rendering and k not in ["statistics", "cache"] }
+        key = repr(sorted(kwargs.items()))
+        _, protocols = groups.setdefault(key, (kwargs, []))
+        protocols.extend(protocol for protocol in entry["protocols"] if protocol not in protocols)
+        entry["key"] = key
+        entry["options"] = options
+
+    constructed = {}
+    for key, (kwargs, protocols) in groups.items():
+        for protocol, model in zip(protocols, models(*protocols, jobs=jobs, cache=cache, **kwargs)):
+            constructed[(key, protocol)] = model
+
+    for entry in manifest:
+        output = os.path.join(directory, entry["output"])
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        with open(output, "tw") as f, contextlib.redirect_stdout(f):
+            if "key" not in entry:
+                bgv_parameters().table(**entry.get("options", {}))
+                continue
+            options = entry["options"]
+            # the equivalent `table` command, so each table can be regenerated on its own
+            print("% generated by:")
+            print("% python", shlex.join([sys.argv[0], "table", *entry["protocols"]] + [f"--{k}" if v is True else f"--{k}={v}" for k, v in options.items()]))
+            render([constructed[(entry["key"], protocol)] for protocol in entry["protocols"]], **{ k : v for k, v in options.items() if k in rendering })
+
+    if cache is not None:
+        cache.update()
+        print(f"% model cache: {cache}", file=sys.stderr)
+    if statistics:
+        print(f"% simplification cache: {simplify}", file=sys.stderr)
+
+def scenarios(*protocols, options=None, roles=True, phases=[SETUP_PHASE, OFFLINE_PHASE, ONLINE_PHASE, VERIFICATION_PHASE], all=False, jobs=None, cache=True, **kwargs):
+    """
+    Evaluate the protocols for a matrix of scenarios (all combinations of their scenario options and of the roles of the input and output parties) and compare each scenario with the default one.
+
+    Prints a TSV row per protocol, scenario, phase, kind, and location (e.g., "compute_party_to_bulletin_board", or "total") whose costs differ from the default scenario.
+
+    :param options: Names of the scenario options to vary (default: all options of the given protocols); each option is set to `True` and `False`.
+    :param roles: Also let the compute parties provide the inputs and/or receive the outputs.
+    :param all: Also print the costs that do not differ.
+    :param jobs: See `construct`.
+    :param cache: See `table`.
+    :param kwargs: Workload, input and output party, and options that are the same for all scenarios.
+    """
+    if cache:
+        cache = ModelCache(None if cache is True else cache)
+    else:
+        cache = None
+
+    tasks = []
+    labels = []
+    for protocol in protocols:
+        defaults = globals()[protocol].options | { "input_party" : INPUT_PARTY, "output_party" : OUTPUT_PARTY }
+        axes = { name : [default, not default] for name, default in defaults.items() if name in scenario_options(protocol) and (options is None or name in options) and name not in kwargs }
+        if roles:
+            axes |= { name : [default, COMPUTE_PARTY] for name, default in defaults.items() if name in ["input_party", "output_party"] and name not in kwargs }
+        for values in product(*axes.values()):
+            scenario = dict(zip(axes, values))
+            tasks.append((protocol, { k : v for k, v in kwargs.items() if k not in scenario_options() or k in scenario_options(protocol) } | scenario))
+            labels.append(",".join(f"{name}={value}" for name, value in scenario.items() if value != defaults[name]) or "default")
+
+    tsv = writer(sys.stdout, delimiter="\t", quoting=QUOTE_NONE)
+    tsv.writerow(["protocol", "scenario", "phase", "kind", "location", "default", "value", "difference"])
+    results = construct(tasks, jobs=jobs, cache=cache)
+    default = None
+    for (protocol, _), label, result in zip(tasks, labels, results):
+        if label == "default":
+            default = result
+            continue
+        for phase in phases:
+            for kind in ["communication", "computation"]:
+                try:
+                    expected = getattr(default.phases[phase], kind)
+                except KeyError:
+                    expected = None
+                try:
+                    actual = getattr(result.phases[phase], kind)
+                except KeyError:
+                    actual = None
+                expected = {} if expected is None else expected.summary() | { "total" : expected.total() }
+                actual = {} if actual is None else actual.summary() | { "total" : actual.total() }
+                for location in list(expected) + [location for location in actual if location not in expected]:
+                    difference = simplify(sympy.sympify(actual.get(location, 0) - expected.get(location, 0)))
+                    if all or difference != 0:
+                        tsv.writerow([protocol, label, phase, kind, location, expected.get(location, 0), actual.get(location, 0), difference])
+
+
+def operations(amount):
+    """Split an amount into its coefficients (expressions of the workload) by operation or element name"""
+    if isinstance(amount, Counts):
+        return dict(amount)
+    coefficients = {}
+    for term in sympy.Add.make_args(sympy.expand(amount)):
+        coefficient, what = term.as_independent(*[x for x in term.free_symbols if x not in WORKLOAD], as_Add=False)
+        coefficients[str(what)] = coefficients.get(str(what), 0) + coefficient
+    return coefficients
+
+def records(protocol, model, phases=PHASES):
+    """Yield the costs of a model as one record (dict) per phase, kind, source, destination (`None` for computation), and operation or element"""
+    for phase in phases:
+        try:
+            complexity = model.phases[phase]
+        except KeyError:
+            continue
+        cells = [("communication", source, destination, amount) for (source, destination), amount in complexity.communication.communication.items()]
+        cells += [("computation", location, None, amount) for location, amount in complexity.computation.computation.items()]
+        for kind, source, destination, amount in cells:
+            for what, coefficient in operations(amount).items():
+                if coefficient != 0:
+                    yield { "protocol" : protocol, "phase" : phase, "kind" : kind, "source" : source, "destination" : destination, "symbol" : what, "coefficient" : coefficient }
+
+def export(*protocols, format="jsonl", file="--", phases=[SETUP_PHASE, OFFLINE_PHASE, ONLINE_PHASE, VERIFICATION_PHASE], numeric=Protocol_numeric, cache=True, input_party=INPUT_PARTY, output_party=OUTPUT_PARTY, **kwargs):
+    """
+    Write the cost models as records (see `records`) in JSON Lines or TSV; the models are constructed and written one at a time.
+
+    Coefficients are written as sympy expressions of the workload (n, nI, nO, I, A, S, M, publicO, privateO) or, for the numeric backend, as numbers.
+
+    :param format: "jsonl" or "tsv".
+    :param file: Output file ("--" for stdout).
+    :param numeric: Use the numeric backend (requires integer workloads, see `parity`).
+    :param cache: See `table` (not used for the numeric backend).
+    """
+    global Protocol_numeric
+    if format not in ["jsonl", "tsv"]:
+        raise ValueError(f"Unknown format {format}; use jsonl or tsv")
+    if cache and not numeric:
+        cache = ModelCache(None if cache is True else cache)
+    else:
+        cache = None
+
+    file = sys.stdout if file == "--" else open(file, "tw")
+    fields = ["protocol", "phase", "kind", "source", "destination", "symbol", "coefficient"]
+    tsv = writer(file, delimiter="\t", quoting=QUOTE_NONE)
+    if format == "tsv":
+        tsv.writerow(fields)
+    try:
+        for protocol in protocols:
+            previous, Protocol_numeric = Protocol_numeric, numeric
+            try:
+                [model] = models(protocol, input_party=input_party, output_party=output_party, jobs=1, cache=cache, **kwargs)
+            finally:
+                Protocol_numeric = previous
+            for record in records(protocol, model, phases):
+                coefficient = record["coefficient"]
+                record["coefficient"] = coefficient if isinstance(coefficient, (int, float)) else str(coefficient)
+                if format == "jsonl":
+                    print(json.dumps(record), file=file)
+                else:
+                    tsv.writerow(["" if record[field] is None else record[field] for field in fields])
+    finally:
+        if file is not sys.stdout:
+            file.close()
+
+def grid_values(values):
+    """Interpret a grid axis given on the command line: a tuple as arguments to `range`, a list as is, and anything else as single value"""
+    if isinstance(values, tuple):
+        values = range(*values)
+    elif not isinstance(values, list):
+        values = [values]
+    return numpy.array(values, dtype=numpy.float64)
+
+def lambdify(expr, weights={}):
+    """Compile `expr` into a NumPy function of the workload; other symbols (elements and operations) are replaced by their weight (default: 1)"""
+    expr = sympy.sympify(expr)
+    expr = expr.subs([(x, weights.get(x.name, 1)) for x in expr.free_symbols if x not in WORKLOAD])
+    return sympy.lambdify(WORKLOAD, expr, modules="numpy")
+
+def workload_axes(grid, variable=None):
+    """Check the grid values of the workload symbols (except `variable`) and return them as one axis per workload symbol (`None` for `variable`)"""
+    symbols = { x.name : x for x in WORKLOAD }
+    for name in grid:
+        if name not in symbols:
+            raise ValueError(f"Unknown workload symbol {name}; use one of {', '.join(symbols)}")
+        if name == variable:
+            raise ValueError(f"No values should be given for {name}, the variable to search")
+    missing = [name for name in symbols if name not in grid and name != variable]
+    if missing:
+        raise ValueError(f"Missing values for the workload symbols {', '.join(missing)}")
+
+    axes = [None if x.name == variable else grid_values(grid[x.name]) for x in WORKLOAD]
+    for x, axis in zip(WORKLOAD, axes):
+        if axis is not None and numpy.any(axis < 0):
+            raise ValueError(f"The models assume {x} >= 0")
+    return axes
+
+def singular(expr):
+    """Workload symbols that `expr` divides by or takes the logarithm of (which must not be zero)"""
+    result = set()
+    for node in sympy.preorder_traversal(sympy.sympify(expr)):
+        if isinstance(node, sympy.Pow) and node.exp.is_negative:
+            result |= node.base.free_symbols
+        elif isinstance(node, sympy.log):
+            result |= node.free_symbols
+    return result & set(WORKLOAD)
+
+def check_singular(expr, axes, description):
+    """Check that the grid values (see `workload_axes`) of the workload symbols `expr` divides by or takes the logarithm of are not zero"""
+    symbols = singular(expr)
+    for x, axis in zip(WORKLOAD, axes):
+        if axis is not None and x in symbols and numpy.any(axis == 0):
+            raise ValueError(f"The {description} divides by or takes the logarithm of {x}, which must not be zero")
+
+def sweep(*protocols, phases=[SETUP_PHASE, OFFLINE_PHASE, ONLINE_PHASE, VERIFICATION_PHASE], weights={}, file="--", input_party=INPUT_PARTY, output_party=OUTPUT_PARTY, **grid):
+    """
+    Evaluate the total communication and computation of each phase over a grid of workloads.
+
+    :param weights: Weight (e.g., size in bytes or time) per element or operation symbol, e.g., "{field: 8, ciphertext: 1048576}"; missing symbols have weight 1.
+    :param file: Output file; written as NumPy archive if it ends with ".npz" and as TSV otherwise ("--" for stdout).
+    :param grid: Values for each workload symbol (n, nI, nO, I, A, S, M, publicO, privateO); lists are used as is, tuples are interpreted as Python `range`.
+    """
+    axes = workload_axes(grid)
+    points = numpy.meshgrid(*axes, indexing="ij", sparse=True)
+    shape = tuple(len(axis) for axis in axes)
+
+    columns = {}
+    for protocol, model in zip(protocols, models(*protocols, input_party=input_party, output_party=output_party)):
+        for phase in phases:
+            try:
+                complexity = model.phases[phase]
+                communication = sympy.Add(*complexity.communication.communication.values())
+                computation = sympy.Add(*complexity.computation.computation.values())
+            except KeyError:
+                communication = computation = 0
+            for kind, expr in [("communication", communication), ("computation", computation)]:
+                check_singular(expr, axes, f"{phase} {kind} of {protocol}")
+                columns[f"{protocol}:{phase}:{kind}"] = numpy.broadcast_to(lambdify(expr, weights)(*points), shape)
+
+    if file.endswith(".npz"):
+        numpy.savez(file, **{ x.name : axis for x, axis in zip(WORKLOAD, axes) }, **columns)
+    else:
+        table = numpy.stack([numpy.broadcast_to(point, shape) for point in points] + list(columns.values()), axis=-1).reshape(-1, len(WORKLOAD) + len(columns))
+        numpy.savetxt(sys.stdout if file == "--" else file, table, fmt="%.17g", delimiter="\t", header="\t".join([x.name for x in WORKLOAD] + list(columns)), comments="")
+
+def crossover(reference, *protocols, variable="M", lower=1, upper=2**32, samples=256, phases=[SETUP_PHASE, OFFLINE_PHASE, ONLINE_PHASE, VERIFICATION_PHASE], parties=[COMPUTE_PARTY, INPUT_PARTY, OUTPUT_PARTY], weights={}, iterations=64, input_party=INPUT_PARTY, output_party=OUTPUT_PARTY, **grid):
+    """
+    Find the values of one workload symbol at which the reference protocol and other protocols are equally expensive.
+
+    For each phase, party (communication sent or computation done by the party, or "all"), and grid point of the other workload symbols,
+    the difference of the models is sampled between `lower` and `upper` and every sign change is refined by bisection.
+
+    :param variable: Workload symbol to search (n, nI, nO, I, A, S, M, publicO, privateO).
+    :param samples: Number of samples between `lower` and `upper` (geometrically spaced if `lower` > 0); crossovers closer than the sample distance may be missed.
+    :param weights: Weight per element or operation symbol as for `sweep`, or "bytes" for the element sizes of `element_sizes` (with default parameters).
+    :param grid: Values for the other workload symbols as for `sweep`.
+    """
+    if weights == "bytes":
+        weights = { x.name : size for x, size in element_sizes().items() }
+    symbols = { x.name : x for x in WORKLOAD }
+    if variable not in symbols:
+        raise ValueError(f"Unknown workload symbol {variable}; use one of {', '.join(symbols)}")
+    if lower < 0:
+        raise ValueError(f"The models assume {variable} >= 0")
+    axes = workload_axes(grid, variable)
+    if lower > 0:
+        values = numpy.geomspace(lower, upper, samples)
+    else:
+        values = numpy.linspace(lower, upper, samples)
+
+    # arrays broadcasting to (grid..., samples)
+    dimensions = len(WORKLOAD)
+    points = [values.reshape((1,) * dimensions + (-1,)) if axis is None else axis.reshape((1,) * i + (-1,) + (1,) * (dimensions - i)) for i, axis in enumerate(axes)]
+    shape = tuple(1 if axis is None else len(axis) for axis in axes) + (samples,)
+    others = [i for i, axis in enumerate(axes) if axis is not None]
+
+    def costs(model):
+        """Expressions by (phase, kind, party)"""
+        communication = model.communication_matrix(phases).sum(axis=2)
+        computation = model.computation_matrix(phases)
+        result = {}
+        for p, phase in enumerate(phases):
+            for kind, matrix in [("communication", communication), ("computation", computation)]:
+                for i, party in enumerate(PARTIES):
+                    if party in parties:
+                        result[(phase, kind, party)] = matrix[p, i]
+                result[(phase, kind, "all")] = matrix[p].sum()
+        return result
+
+    tsv = writer(sys.stdout, delimiter="\t", quoting=QUOTE_NONE)
+    tsv.writerow(["reference", "protocol", "phase", "kind", "party"] + [WORKLOAD[i].name for i in others] + [variable, "cheaper-above"])
+    results = models(reference, *protocols, input_party=input_party, output_party=output_party)
+    reference_costs = costs(results[0])
+    for protocol, model in zip(protocols, results[1:]):
+        for (phase, kind, party), expr in costs(model).items():
+            difference = sympy.sympify(expr - reference_costs[(phase, kind, party)])
+            if difference == 0:
+                continue
+            check_singular(difference, axes, f"{phase} {kind} of {protocol} or {reference}")
+            if lower == 0 and symbols[variable] in singular(difference):
+                raise ValueError(f"The {phase} {kind} of {protocol} or {reference} divides by or takes the logarithm of {variable}, so `lower` must be positive")
+            f = lambdify(difference, weights)
+            signs = numpy.sign(numpy.broadcast_to(f(*points), shape))
+
+            # brackets [values[k], values[k+1]] with a sign change (or reaching zero)
+            brackets = numpy.nonzero((signs[..., :-1] * signs[..., 1:] < 0) | ((signs[..., 1:] == 0) & (signs[..., :-1] != 0)))
+            coordinates = [axis[index] if axis is not None else None for axis, index in zip(axes, brackets[:-1])]
+            low = values[brackets[-1]]
+            high = values[brackets[-1] + 1]
+            low_signs = signs[brackets[:-1] + (brackets[-1],)]
+            for _ in range(iterations):
+                middle = (low + high) / 2
+                middle_signs = numpy.sign(numpy.broadcast_to(f(*[middle if x is None else x for x in coordinates]), middle.shape))
+                same = middle_signs == low_signs
+                low = numpy.where(same, middle, low)
+                high = numpy.where(same, high, middle)
+            for j in range(len(high)):
+                # above the crossover, the difference has the opposite sign of below
+                tsv.writerow([reference, protocol, phase, kind, party] + [f"{coordinates[i][j]:g}" for i in others] + [high[j], reference if low_signs[j] < 0 else protocol])
+
+def read_calibration(*files):
+    """
+    Read seconds per operation from calibration files or benchmark reports.
+
+    Calibration files have the header "device, prime, symbol, seconds".
+    Benchmark reports are the TSV files written by "scripts/authentication.py" and "scripts/mac.py".
+    Returns a dictionary of seconds per operation symbol for each (device, prime) pair.
+    """
+    calibration = {}
+    benchmarks = {}
+    for file in files:
+        with open(file) as f:
+            for i, line in enumerate(reader(f, delimiter="\t", quoting=QUOTE_NONE)):
+                if i == 0 and line == ["device", "prime", "symbol", "seconds"]:
+                    continue
+                if len(line) == 4:
+                    device, prime, symbol, seconds = line
+                    calibration.setdefault((device, int(prime)), {})[symbol] = float(seconds)
+                    continue
+                command, output = line
+                binary, _, processors = command.split()
+                count, seconds = output.split()
+                device = "gpu" if int(processors) < 0 else "cpu"
+                name = os.path.basename(binary)
+                if match := re.fullmatch(r"(?:.*-)?drowning-bgv-(?P<prime>\d+)", name):
+                    key = ("authentication", device, int(match.group("prime")), None)
+                elif match := re.fullmatch(r"(?:.*-)?mac-(?P<prime>\d+)-(?P<parties>\d+)", name):
+                    key = ("mac", device, int(match.group("prime")), int(match.group("parties")))
+                else:
+                    raise ValueError(f"Unknown benchmark binary: {binary}")
+                benchmarks.setdefault(key, []).append(float(seconds) / int(count))
+
+    # MAC check per value: one PRF evaluation per party and x * alpha + r
+    mac = {}
+    for (benchmark, device, prime, parties), times in benchmarks.items():
+        if benchmark == "mac":
+            mac.setdefault((device, prime), []).append((parties, numpy.mean(times)))
+    for key, points in mac.items():
+        parties, times = numpy.array(sorted(points)).T
+        if len(parties) > 1:
+            prf, rest = numpy.polyfit(parties, times, 1)
+        else:
+            prf, rest = times[0] / parties[0], 0 # attribute everything to the PRF
+        operations = calibration.setdefault(key, {})
+        operations.setdefault(PRF_EVALUATION.name, max(prf, 0))
+        operations.setdefault(f"{FIELD_ELEMENT}_multiplication", max(rest, 0))
+
+    # verifying the authentication per value: PRF, drowning encryption, and alpha * c + d
+    for (benchmark, device, prime, _), times in benchmarks.items():
+        if benchmark == "authentication":
+            operations = calibration.setdefault((device, prime), {})
+            operations.setdefault(DROWNING_ENCRYPTION_EVALUATION.name, max(numpy.mean(times) - operations.get(PRF_EVALUATION.name, 0), 0))
+
+    return calibration
+
+def calibrate(*files, file="--"):
+    """
+    Derive seconds per operation from benchmark reports and write them as calibration file.
+
+    :param files: Reports of "scripts/authentication.py" and "scripts/mac.py" or other calibration files (e.g., of additional micro-benchmarks).
+    """
+    calibration = read_calibration(*files)
+    with contextlib.nullcontext(sys.stdout) if file == "--" or file is None else open(file, "tw") as f:
+        tsv = writer(f, delimiter="\t", quoting=QUOTE_NONE)
+        tsv.writerow(["device", "prime", "symbol", "seconds"])
+        for (device, prime), operations in sorted(calibration.items()):
+            for symbol, seconds in sorted(operations.items()):
+                tsv.writerow([device, prime, symbol, seconds])
+
+def runtime(*protocols, calibration, device="cpu", prime=64, phases=[SETUP_PHASE, OFFLINE_PHASE, ONLINE_PHASE, VERIFICATION_PHASE], target=None, input_party=INPUT_PARTY, output_party=OUTPUT_PARTY, **kwargs):
+    """
+    Predict the computation time per phase and party from calibrated seconds per operation.
+
+    :param calibration: Calibration file(s) or benchmark reports (see `calibrate`).
+    :param device: "cpu" or "gpu" (the latter corresponds to "--processors -1" in the benchmarks).
+    :param prime: Plaintext modulus size (64 or 128).
+    :param target: Latency target in seconds; phases exceeding it are marked.
+    """
+    if isinstance(calibration, str):
+        calibration = [calibration]
+    try:
+        seconds = read_calibration(*calibration)[(device, prime)]
+    except KeyError:
+        raise ValueError(f"No calibration for device {device} with {prime} bit prime")
+
+    uncalibrated = set()
+    tsv = writer(sys.stdout, delimiter="\t", quoting=QUOTE_NONE)
+    tsv.writerow(["protocol", "phase", "party", "seconds"] + ([] if target is None else ["meets-target"]))
+    for protocol, model in zip(protocols, models(*protocols, input_party=input_party, output_party=output_party, **kwargs)):
+        for phase in phases:
+            try:
+                computation = model.phases[phase].computation.computation
+            except KeyError:
+                computation = {}
+            times = {}
+            for party, expr in computation.items():
+                expr = sympy.sympify(expr)
+                symbols = [x for x in expr.free_symbols if x not in WORKLOAD]
+                uncalibrated.update(x.name for x in symbols if x.name not in seconds)
+                times[party] = simplify(expr.subs([(x, seconds.get(x.name, 0)) for x in symbols]))
+            times["max"] = sympy.Max(0, *times.values()) # parties compute in parallel
+            for party, seconds_total in times.items():
+                row = [protocol, phase, party, seconds_total]
+                if target is not None:
+                    row.append(bool(seconds_total <= target) if seconds_total.is_number else "")
+                tsv.writerow(row)
+    if uncalibrated:
+        print(f"% uncalibrated operations (counted as 0 seconds): {', '.join(sorted(uncalibrated))}", file=sys.stderr)
+
+@cache
+def bgv_parameters():
+    """Load "bgv-parameters.py" as module (its name is not a valid module name)"""
+    spec = importlib.util.spec_from_file_location("bgv_parameters", os.path.join(os.path.dirname(os.path.abspath(__file__)), "bgv-parameters.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def element_sizes(log_p=64, log_n=16, zeroknowledge_sec=64, soundness_sec=128, seed=42):
+    """
+    Size in bytes of each communicated element for a BGV parameter set (see "scripts/bgv-parameters.py").
+
+    Ciphertexts pack N plaintext slots and the complexity models count per plaintext value;
+    therefore, everything derived from ciphertexts is amortized over the N slots.
+    """
+    parameters = bgv_parameters().parameters(log_p, log_n, zeroknowledge_sec, soundness_sec, seed=seed)
+    bits = bgv_parameters().bits
+    N = parameters["N"]
+    U = parameters["U"]
+    V = parameters["V"]
+    log_q = parameters["log_q"]
+
+    field = math.ceil(log_p / 8)
+    ciphertext = 2 * math.ceil(N * log_q / 8) / N # two ring elements
+    ciphertext_field = math.ceil(N * log_q / 8) / N # one ring element, e.g., a decryption share
+    # proof for U ciphertexts: V ciphertexts as commitment, V responses with a plaintext and three randomness polynomials
+    response = bits(U * 2**zeroknowledge_sec) + math.ceil(log_p) + 2 * bits(20 * U * 2**zeroknowledge_sec) + bits(U * 2**zeroknowledge_sec)
+    zk = V * (ciphertext + math.ceil(N * response / 8) / N) / U
+    commitment = math.ceil(2 * soundness_sec / 8) # hash
+    decommitment = field + math.ceil(soundness_sec / 8) # opened value and randomness
+
+    sizes = {
+        BOOLEAN_ELEMENT : 1,
+        FIELD_ELEMENT : field,
+        CIPHERTEXT_FIELD_ELEMENT : ciphertext_field,
+        CIPHERTEXT_ELEMENT : ciphertext,
+        COMMITMENT_ELEMENT : commitment,
+        DECOMMITMENT : decommitment,
+        ZK : zk,
+        PUBLIC_KEY_ZK : zk,
+        COMMITMENT_ZK : zk,
+        DISTRIBUTED_DECRYPTION : ciphertext_field + zk,
+    }
+    for x, size in list(sizes.items()):
+        sizes[sympy.Symbol(f"public_random_{x}")] = size
+    return sizes
+
+def bandwidth_bits(bandwidth):
+    """Bandwidth in bit per second; given in mbit (if int or float) or with units as for `tc`, e.g., "1gbit" (see "scripts/secure-aggregation.py")"""
+    if isinstance(bandwidth, (int, float)):
+        return bandwidth * 10**6
+    match = re.fullmatch(r"(?P<value>[\d.]+)\s*(?P<prefix>[kmgt]?)(?P<unit>bit|bps)", bandwidth.lower())
+    if not match:
+        raise ValueError(f"Invalid bandwidth: {bandwidth}")
+    value = float(match.group("value")) * 1000**"_kmgt".index(match.group("prefix") or "_")
+    return value * 8 if match.group("unit") == "bps" else value
+
+def wire(*protocols, log_p=64, log_n=16, zeroknowledge_sec=64, soundness_sec=128, seed=42, delay=0, bandwidth=0, depth=None, phases=[SETUP_PHASE, OFFLINE_PHASE, ONLINE_PHASE, VERIFICATION_PHASE], input_party=INPUT_PARTY, output_party=OUTPUT_PARTY, **kwargs):
+    """
+    Bytes per link and phase for a BGV parameter set and, optionally, the estimated transfer time.
+
+    :param delay: Network delay in milliseconds.
+    :param bandwidth: Network bandwidth in mbit (if given as int or float) or with units, e.g., "1gbit".
+    :param depth: Multiplicative depth of the circuit; if given, add a rounds column and a row per phase (source and destination "all") with the total bytes and the time of all rounds, assuming all links transfer in parallel.
+    """
+    sizes = element_sizes(log_p, log_n, zeroknowledge_sec, soundness_sec, seed)
+    tsv = writer(sys.stdout, delimiter="\t", quoting=QUOTE_NONE)
+    tsv.writerow(["protocol", "phase", "source", "destination", "bytes"] + (["seconds"] if bandwidth else []) + (["rounds"] if depth is not None else []))
+    for protocol, model in zip(protocols, models(*protocols, input_party=input_party, output_party=output_party, **kwargs)):
+        for phase in phases:
+            try:
+                communication = model.phases[phase].communication.communication
+            except KeyError:
+                continue
+            sizes_ = []
+            for (source, destination), expr in communication.items():
+                expr = sympy.sympify(expr)
+                unknown = [x for x in expr.free_symbols if x not in WORKLOAD and x not in sizes]
+                if unknown:
+                    raise ValueError(f"Unknown size of {', '.join(map(str, unknown))}")
+                size = simplify(expr.subs(sizes))
+                sizes_.append(size)
+                row = [protocol, phase, source, destination, size]
+                if bandwidth:
+                    row.append(simplify(delay / 1000 + 8 * size / bandwidth_bits(bandwidth)) if size != 0 else 0)
+                if depth is not None:
+                    row.append("")
+                tsv.writerow([float(x) if isinstance(x, sympy.Expr) and x.is_number else x for x in row])
+            if depth is not None:
+                rounds = sympy.sympify(model.rounds(phase)).subs(MULTIPLICATION_DEPTH, depth)
+                row = [protocol, phase, "all", "all", sympy.Add(*sizes_)]
+                if bandwidth:
+                    row.append(simplify(rounds * delay / 1000 + 8 * (sympy.Max(*sizes_) if sizes_ else 0) / bandwidth_bits(bandwidth)))
+                row.append(rounds)
+                tsv.writerow([float(x) if isinstance(x, sympy.Expr) and x.is_number else x for x in row])
+
+NET_STATS_FIELD = re.compile(r"(?P<name>[a-z]+(?: [a-z]+)*): (?P<value>\d+(?:\.\d+)?)(?: (?P<unit>B|KiB|MiB|GiB|TiB|PiB))?")
+
+def read_net_stats(*files):
+    """
+    Read the traffic of each party from the logs of "scripts/secure-aggregation.py" (written with `--all`).
+
+    Each party prints its network statistics as last "[Party N, ...]" line, formatted by hmpc 0.5.2 with `{:nhU}`:
+    comma-separated fields with their name ("n"), human-readable sizes ("h") in IEC units ("U"), e.g., "sent: 1.5 MiB, received: 12 KiB, messages: 40".
+    The "sent" and "received" fields are used; lines in any other format raise a `ValueError`.
+    Returns a list of dictionaries with the party type ("compute" or "input"), party id, count, repeat, number of servers, clients, and elements, and the sent and received bytes.
+    """
+    def traffic(stats):
+        fields = {}
+        for field in stats.split(", "):
+            match = NET_STATS_FIELD.fullmatch(field)
+            if match is None:
+                raise ValueError(f"Cannot read the network statistics field {field!r} of: {stats}")
+            fields[match.group("name")] = match
+        try:
+            return tuple(float(fields[name].group("value")) * 1024**"B KiB MiB GiB TiB PiB".split().index(fields[name].group("unit") or "B") for name in ["sent", "received"])
+        except KeyError as e:
+            raise ValueError(f"Missing {e} in the network statistics: {stats}") from None
+
+    results = []
+    for file in files:
+        with open(file) as f:
+            sections = re.split(r"^# (\w+) (\d+) \(count (\d+), processors -?\d+, repeat (\d+)\)$", f.read(), flags=re.MULTILINE)
+        for party_type, party_id, count, repeat, output in zip(*[iter(sections[1:])] * 5):
+            info = re.search(r"^\[Party \d+, \w+, (\d+) servers(?:, (\d+) clients)?, .* = (\d+) elements", output, re.MULTILINE)
+            stats = re.findall(r"^\[Party \d+, (.*)\]$", output, re.MULTILINE)
+            if info is None or len(stats) < 2:
+                raise ValueError(f"Incomplete output of {party_type} party {party_id} (count {count}, repeat {repeat}) in {file}")
+            sent, received = traffic(stats[-1])
+            servers, clients, elements = info.groups()
+            results.append(dict(party=party_type, id=int(party_id), count=int(count), repeat=int(repeat), servers=int(servers), clients=int(clients or 0), elements=int(elements), sent=sent, received=received))
+    return results
+
+def reconcile(*logs, protocol="OurProtocol", log_p=64, log_n=16, zeroknowledge_sec=64, soundness_sec=128, seed=42, phases=[ONLINE_PHASE, VERIFICATION_PHASE], input_party=INPUT_PARTY, output_party=OUTPUT_PARTY, **kwargs):
+    """
+    Compare the traffic measured by "scripts/secure-aggregation.py" (see `read_net_stats`) with the bytes of the model (see `wire`).
+
+    The workload is derived from the logs: the servers are the compute parties, the clients are the input and output parties, and each client inputs its elements which are summed up and output publicly.
+    Broadcasts (to the bulletin board) are counted as sent to all other parties.
+    The parties measure their traffic for the whole run, so the model is summed up over `phases` (by default, the phases the secure aggregation demo runs; the offline phase is precomputed locally);
+    a row per phase gives the bytes of the model and a "total" row the measured bytes and the deviation (measured / modelled - 1).
+
+    :param kwargs: Workload overriding the derived one (parties, input_parties, output_parties, inputs, additions, scalar_multiplications, multiplications, public_outputs, private_outputs) and scenario options.
+    """
+    sizes = element_sizes(log_p, log_n, zeroknowledge_sec, soundness_sec, seed)
+    measurements = {}
+    for result in read_net_stats(*logs):
+        key = (result["count"], result["servers"], result["clients"], result["elements"])
+        measurements.setdefault(key, {}).setdefault(result["party"], []).append((result["sent"], result["received"]))
+
+    tsv = writer(sys.stdout, delimiter="\t", quoting=QUOTE_NONE)
+    tsv.writerow(["count", "servers", "clients", "party", "direction", "phase", "modelled", "measured", "deviation"])
+    for (count, servers, clients, elements), parties in sorted(measurements.items()):
+        workload = dict(parties=servers, input_parties=clients, output_parties=clients, inputs=clients * elements, additions=(clients - 1) * elements, scalar_multiplications=0, multiplications=0, public_outputs=elements, private_outputs=0)
+        [model] = models(protocol, input_party=input_party, output_party=output_party, **(workload | kwargs))
+        counts = { COMPUTE_PARTY : model.parties, INPUT_PARTY : model.input_parties, OUTPUT_PARTY : model.output_parties }
+        physical = { COMPUTE_PARTY : "compute", INPUT_PARTY : "input", OUTPUT_PARTY : "input" } # clients are input and output parties
+        recipients = servers + clients - 1 # of a broadcast
+
+        modelled = {}
+        for phase in phases:
+            matrix = model.communication_matrix([phase])[0]
+            for i, source in enumerate(PARTIES):
+                for j, destination in enumerate(RECEIVERS):
+                    amount = float(sympy.sympify(matrix[i, j]).subs(sizes))
+                    if amount == 0:
+                        continue
+                    sender = physical[source]
+                    if destination == BULLETIN_BOARD:
+                        # every party receives all broadcasts except its own
+                        modelled[(sender, "sent", phase)] = modelled.get((sender, "sent", phase), 0) + amount * recipients / float(counts[source])
+                        for party in ["compute", "input"]:
+                            own = amount / float(counts[source]) if party == sender else 0
+                            modelled[(party, "received", phase)] = modelled.get((party, "received", phase), 0) + amount - own
+                    else:
+                        modelled[(sender, "sent", phase)] = modelled.get((sender, "sent", phase), 0) + amount / float(counts[source])
+                        receiver = physical[destination]
+                        modelled[(receiver, "received", phase)] = modelled.get((receiver, "received", phase), 0) + amount / float(counts[destination])
+
+        for party, traffic in sorted(parties.items()):
+            for index, direction in enumerate(["sent", "received"]):
+                for phase in phases:
+                    tsv.writerow([count, servers, clients, party, direction, phase, modelled.get((party, direction, phase), 0), "", ""])
+                total = sum(modelled.get((party, direction, phase), 0) for phase in phases)
+                measured = numpy.mean([x[index] for x in traffic])
+                tsv.writerow([count, servers, clients, party, direction, "total", total, measured, measured / total - 1 if total else ""])
+
+def construction(*protocols, deferred=Complexity_deferred_accumulation, numeric=Protocol_numeric, repeats=1, **kwargs):
+    """
+    Measure how long it takes to construct the models of the given protocols.
+
+    :param deferred: Use the ledger backend (`True`) or sum up costs directly (`False`).
+    :param numeric: Count operations as integers instead of sympy expressions (requires integer workloads, see `parity`).
+    :param repeats: Number of constructions per protocol; the minimum time is reported.
+    """
+    global Complexity_deferred_accumulation, Protocol_numeric
+    previous = Complexity_deferred_accumulation, Protocol_numeric
+    Complexity_deferred_accumulation, Protocol_numeric = deferred, numeric
+    try:
+        print("protocol\tevents\tseconds")
+        for protocol in protocols:
+            times = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                model = globals()[protocol](**kwargs)
+                times.append(time.perf_counter() - start)
+            print(f"{protocol}\t{model.events}\t{min(times):.6f}")
+    finally:
+        Complexity_deferred_accumulation, Protocol_numeric = previous
+
+def parity(*protocols, tolerance=1e-9, input_party=INPUT_PARTY, output_party=OUTPUT_PARTY, **grid):
+    """
+    Check that the numeric backend (`Protocol_numeric`) yields the same costs as the sympy models for each workload of a grid.
+
+    Prints a TSV row per protocol and workload with the number of compared and differing cells (communication and computation of each phase) and the construction times; exits with an error if any cell differs.
+
+    :param tolerance: Relative tolerance (models that divide or take logarithms of the workload count in floating point).
+    :param grid: Integer values for each workload symbol (see `sweep`).
+    """
+    global Protocol_numeric
+    def coefficients(amount):
+        """Numeric coefficient by operations and elements"""
+        result = {}
+        for term in sympy.Add.make_args(sympy.expand(amount.as_expr() if isinstance(amount, Counts) else amount)):
+            key = frozenset(x.name for x in term.free_symbols)
+            result[key] = result.get(key, 0) + float(term.subs({ x : 1 for x in term.free_symbols }))
+        return result
+
+    axes = workload_axes(grid)
+    for x, axis in zip(WORKLOAD, axes):
+        if numpy.any(axis != numpy.round(axis)):
+            raise ValueError(f"The numeric backend requires integer values for {x}")
+
+    tsv = writer(sys.stdout, delimiter="\t", quoting=QUOTE_NONE)
+    tsv.writerow(["protocol"] + [x.name for x in WORKLOAD] + ["cells", "differences", "symbolic_seconds", "numeric_seconds"])
+    failures = 0
+    for protocol in protocols:
+        # the constructor parameters default to the workload symbols
+        parameters = { parameter.default : name for name, parameter in inspect.signature(globals()[protocol]).parameters.items() }
+        for point in numpy.array(numpy.meshgrid(*axes, indexing="ij")).reshape(len(WORKLOAD), -1).T:
+            kwargs = { parameters[x] : int(value) for x, value in zip(WORKLOAD, point) }
+            times = []
+            results = []
+            for numeric in [False, True]:
+                Protocol_numeric = numeric
+                try:
+                    start = time.perf_counter()
+                    [result] = models(protocol, input_party=input_party, output_party=output_party, jobs=1, **kwargs)
+                    times.append(time.perf_counter() - start)
+                finally:
+                    Protocol_numeric = False
+                results.append(result)
+            symbolic, numeric = results
+
+            cells = differences = 0
+            for phase in PHASES:
+                for matrix in ["communication_matrix", "computation_matrix"]:
+                    for expected, value in zip(getattr(symbolic, matrix)([phase]).flat, getattr(numeric, matrix)([phase]).flat):
+                        expected, value = coefficients(expected), coefficients(value)
+                        cells += 1
+                        if any(not math.isclose(expected.get(x, 0), value.get(x, 0), rel_tol=tolerance, abs_tol=tolerance) for x in expected.keys() | value.keys()):
+                            differences += 1
+            failures += differences
+            tsv.writerow([protocol] + [int(value) for value in point] + [cells, differences, f"{times[0]:.6f}", f"{times[1]:.6f}"])
+
+    if failures:
+        sys.exit(f"{failures} cells differ between the numeric and the symbolic models")
+
+def rounds():
+    """
+    Check the communication rounds of the building blocks shared by the models and of each phase of the models.
+
+    Prints a TSV row per building block and per phase of each model with the expected and the counted rounds; exits with an error if any of them differ.
+    """
+    class Block(SPDZLike):
+        def __init__(self, body):
+            super().__init__()
+            self.parties = COMPUTE_PARTY_COUNT
+            with self.in_phase(ONLINE_PHASE):
+                body(self)
+
+    def at_each_party(method):
+        def body(protocol):
+            with protocol.at_each_party(COMPUTE_PARTY, protocol.parties):
+                method(protocol)
+        return body
+
+    def commit_decommit(protocol):
+        protocol.commit()
+        protocol.decommit()
+
+    def in_parallel(protocol):
+        with protocol.in_parallel():
+            at_each_party(commit_decommit)(protocol)
+            at_each_party(Protocol.commit)(protocol)
+
+    def in_branch(protocol):
+        with protocol.in_parallel():
+            with protocol.in_branch():
+                at_each_party(Protocol.commit)(protocol)
+                at_each_party(Protocol.commit)(protocol)
+            at_each_party(Protocol.commit)(protocol)
+
+    blocks = {
+        "broadcast" : (at_each_party(lambda protocol: protocol.broadcast(FIELD)), 1),
+        "commit" : (at_each_party(Protocol.commit), 1),
+        "commit+decommit" : (at_each_party(commit_decommit), 2), # the decommitment is only sent after all commitments are received
+        "Open" : (SPDZLike.Open, 1),
+        "MACCheck" : (SPDZLike.MACCheck, 2),
+        "Check" : (lambda protocol: protocol.Check(1), 3), # public randomness before the MAC check
+        "in_parallel" : (in_parallel, 2), # the longer branch
+        "in_branch" : (in_branch, 2), # contexts in a branch are sequential
+    }
+
+    D = MULTIPLICATION_DEPTH
+    phases = { # rounds of the setup, offline, online, and verification phase of each model
+        "OurProtocol" : [1, 3, D + 4, 4],
+        "BaumOrsiniScholl2016" : [3, 8, D + 2, 2],
+        "SpiniFehr2016" : [1, 7, 2 * D + 10, 3],
+        "CunninghamFullerYakoubov2016" : [1, 13, D + 3, 4],
+        "KellerPastroRotaru2017" : [1, 10, D + 4, 3],
+        "BaumCozzoSmart2019" : [4, 6, D + 2, 3],
+        "CohenDoernerKondiShelat2023" : [1, 11, D, 0], # the verification phase is not modelled yet
+        "BaumMelissarisRachuriScholl2023" : [1, 7, D + 2, 0], # no verification phase
+    }
+
+    tsv = writer(sys.stdout, delimiter="\t", quoting=QUOTE_NONE)
+    tsv.writerow(["block", "expected", "rounds"])
+    failures = 0
+    for name, (body, expected) in blocks.items():
+        value = Block(body).rounds(ONLINE_PHASE)
+        failures += value != expected
+        tsv.writerow([name, expected, value])
+    for protocol, model in zip(phases, models(*phases, jobs=1)):
+        for phase, expected in zip(PHASES, phases[protocol]):
+            value = model.rounds(phase)
+            failures += sympy.simplify(value - expected) != 0
+            tsv.writerow([f"{protocol}:{phase}", expected, value])
+
+    if failures:
+        sys.exit(f"{failures} building blocks or phases have unexpected rounds")
+
+def attribution(*protocols, kind="communication", top=20, folded=None, weights={}, input_party=INPUT_PARTY, output_party=OUTPUT_PARTY, **kwargs):
+    """
+    Attribute the costs of the given protocols to the methods and contexts (phases, parties, loops) they stem from, like a profiler.
+
+    Costs are evaluated for the workload given as constructor arguments (e.g., "--parties=3 --multiplications=1000")
+    with the weights per element or operation symbol as for `sweep` (or "bytes" for the element sizes of `element_sizes`).
+
+    :param kind: "communication" or "computation".
+    :param top: Number of call paths with the highest (inclusive) costs to report.
+    :param folded: File for the (exclusive) costs as folded stacks, e.g., for flame graphs ("--" for stdout instead of the report).
+    """
+    if weights == "bytes":
+        weights = { x.name : size for x, size in element_sizes().items() }
+
+    global Protocol_attribution
+    previous = Protocol_attribution
+    Protocol_attribution = True
+    try:
+        results = models(*protocols, input_party=input_party, output_party=output_party, jobs=1, **kwargs) # the switch is not passed to worker processes
+    finally:
+        Protocol_attribution = previous
+
+    def evaluate(amount):
+        expr = sympy.sympify(amount)
+        expr = expr.subs([(x, weights.get(x.name, 1)) for x in expr.free_symbols if x not in WORKLOAD])
+        if not expr.is_number:
+            raise ValueError(f"Missing values for the workload symbols {', '.join(sorted(x.name for x in expr.free_symbols))} (given as constructor arguments, e.g., --parties=3)")
+        return float(expr)
+
+    inclusive = {} # [value, expression] by call path (and its prefixes)
+    exclusive = {} # value by call path
+    for model in results:
+        for stack, event_kind, amount in model.attribution:
+            if event_kind != kind:
+                continue
+            value = evaluate(amount)
+            exclusive[stack] = exclusive.get(stack, 0) + value
+            for i in range(1, len(stack) + 1):
+                node = inclusive.setdefault(stack[:i], [0, 0])
+                node[0] += value
+                node[1] += amount
+
+    def number(value):
+        return f"{value:f}".rstrip("0").rstrip(".")
+
+    if folded is not None:
+        with contextlib.nullcontext(sys.stdout) if folded == "--" else open(folded, "tw") as f:
+            for stack, value in exclusive.items():
+                if value != 0:
+                    print(f"{';'.join(stack)} {number(value)}", file=f)
+        if folded == "--":
+            return
+
+    tsv = writer(sys.stdout, delimiter="\t", quoting=QUOTE_NONE)
+    tsv.writerow(["inclusive", "exclusive", "share", "path", "expression"])
+    for path, (value, expr) in sorted(inclusive.items(), key=lambda item: -item[1][0])[:top]:
+        total = inclusive[path[:1]][0]
+        tsv.writerow([number(value), number(exclusive.get(path, 0)), f"{100 * value / total:.1f}%" if total else "", ";".join(path), simplify(expr)])
+
 if __name__ == "__main__":
     import fire
     fire.Fire()
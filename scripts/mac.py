@@ -6,6 +6,7 @@ from csv import writer, QUOTE_NONE
 from numpy import mean
 from os import makedirs
 from os.path import dirname
+from json import load
 
 def run(binary, count, processor):
     if processor > 1:
@@ -20,9 +21,16 @@ def experiment(prefix, p, n, count, processor):
     binary = prefix + f"-{p}-{n}"
     return (binary, count, processor), run(binary, count, processor)
 
+def parameter_sets(manifest):
+    """Names of the parameter sets (suffixes of the binaries) written by `python3 scripts/bgv-parameters.py registry`"""
+    with open(manifest) as f:
+        return [entry["name"] for entry in load(f)]
+
 now = f"{datetime.now(timezone.utc).astimezone():%Y-%m-%d-%H%M%S}"
 
-def main(*counts, prefix="build/Release/mac", primes=[64, 128], party_counts=[2], repeats=10, processors=0, data=f"reports/{now}-mac.tsv"):
+def main(*counts, prefix="build/Release/mac", primes=None, party_counts=[2], repeats=10, processors=0, manifest="config/bgv-parameters.json", data=f"reports/{now}-mac.tsv"):
+    if primes is None:
+        primes = parameter_sets(manifest)
     assert len(counts) > 0
     while len(counts) < len(primes):
         counts += [counts[-1]]
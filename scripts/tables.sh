@@ -21,11 +21,14 @@ FINAL_SUBSTITUTION="${SUBSTITUTION-$PAPER_SUBSTITUTION}"
 SHORT_FINAL_SUBSTITUTION="${FINAL_SUBSTITUTION};"
 SHORT_FINAL_SUBSTITUTION+='s/\^\({[0123456789]\+}\)/\\mathrlap{\^\1}/g;'
 
-python3 scripts/complexity.py table KellerPastroRotaru2017 BaumCozzoSmart2019 BaumOrsiniScholl2016 SpiniFehr2016 CunninghamFullerYakoubov2016 CohenDoernerKondiShelat2023 BaumMelissarisRachuriScholl2023 OurProtocol --input-parties=n --output-parties=n --private-outputs=0 --public-outputs=1 --inputs=1 --additions=0 --scalar-multiplications=0 --input_party=compute_party --output_party=compute_party --communication --O-notation=keep-factors --collapse=3 --midrules | sed "$FINAL_SUBSTITUTION" > $DIR/tables/related-work-communication-core.tex
-python3 scripts/complexity.py table KellerPastroRotaru2017 BaumCozzoSmart2019 BaumOrsiniScholl2016 SpiniFehr2016 CunninghamFullerYakoubov2016 CohenDoernerKondiShelat2023 BaumMelissarisRachuriScholl2023 OurProtocol --input-parties=n --output-parties=n --private-outputs=0 --public-outputs=1 --inputs=1 --additions=0 --scalar-multiplications=0 --input_party=compute_party --output_party=compute_party --computation --O-notation=keep-factors --collapse=1 --midrules | sed "$FINAL_SUBSTITUTION" > $DIR/tables/related-work-computation-core.tex
+# all tables are generated by a single process (see scripts/tables.json), so each protocol model is only constructed once
+python3 scripts/complexity.py tables scripts/tables.json --directory $DIR
+
+sed -i "$FINAL_SUBSTITUTION" $DIR/tables/related-work-communication-core.tex
+sed -i "$FINAL_SUBSTITUTION" $DIR/tables/related-work-computation-core.tex
 
 PAPER_SUBSTITUTION='s/c c c c c c c/S\[table-format=3.0\] c S\[table-format=3.0\] c c c c/;s/log-p/{$\\log_2 \\PlaintextModulus$}/;s/log-n/$\\log_2 \\CiphertextSlots$/;s/sec-zk/$\\StatisticalSecurity$/;s/sec-sound/$\\ComputationalSecurity$/;s/log-q/$\\log_2 \\CiphertextModulus$/;s/U \& V/\$\\CiphertextZeroknowledgeBatchSize\$ \& \$\\CiphertextZeroknowledgeAuxilliarySize\$/'
 
 FINAL_SUBSTITUTION="${SUBSTITUTION-$PAPER_SUBSTITUTION}"
 
-python3 scripts/bgv-parameters.py table | sed "$FINAL_SUBSTITUTION" > $DIR/tables/bgv-params-core.tex
+sed -i "$FINAL_SUBSTITUTION" $DIR/tables/bgv-params-core.tex